@@ -26,7 +26,9 @@ def user_login():
         login_manager.authenticate(usr, pwd)
         login_manager.post_login()
 
-        user = frappe.get_doc("User", frappe.session.user)
+        user = frappe.db.get_value(
+            "User", frappe.session.user, ["name", "email", "username"], as_dict=True
+        )
 
         return {
             "success": True,
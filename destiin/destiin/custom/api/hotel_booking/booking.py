@@ -3,6 +3,7 @@ import json
 import requests
 from datetime import datetime
 from urllib.parse import unquote
+from markupsafe import escape
 from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
 
 
@@ -10,6 +11,17 @@ from destiin.destiin.constants import PRICE_COMPARISON_API_URL, HITPAY_REFUND_UR
 
 REFUND_API_URL = HITPAY_REFUND_URL
 
+# Booking statuses accepted from the supplier callback
+VALID_BOOKING_STATUSES = ("confirmed", "cancelled", "pending", "completed")
+
+# Booking status → Cart Hotel Room status
+BOOKING_TO_ROOM_STATUS_MAP = {
+    "confirmed": "booking_success",
+    "cancelled": "booking_failure",
+    "pending": "payment_pending",
+    "completed": "booking_success"
+}
+
 
 def send_booking_confirmation_email(to_emails, employee_name, booking_reference, hotel_name, hotel_address, number_of_rooms, check_in_date, check_in_time, check_out_date, check_out_time, adults, children, guest_email, currency, amount, tax_amount, total_amount, agent_email, hotel_map_url="", email_subject=None):
     """
@@ -50,6 +62,12 @@ def send_booking_confirmation_email(to_emails, employee_name, booking_reference,
     fallback_subject = f"Booking Confirmed - {hotel_name} ({booking_reference})"
     subject = email_subject or fallback_subject
 
+    # Escape caller-supplied text once so guest, hotel and agent values cannot inject markup
+    (employee_name, booking_reference, hotel_name, hotel_address, check_in_date, check_in_time, check_out_date, check_out_time, guest_email, currency, agent_email) = (
+        escape(value) if value else value
+        for value in (employee_name, booking_reference, hotel_name, hotel_address, check_in_date, check_in_time, check_out_date, check_out_time, guest_email, currency, agent_email)
+    )
+
     body = f"""<!DOCTYPE html>
 <html lang="en" xmlns="http://www.w3.org/1999/xhtml" xmlns:v="urn:schemas-microsoft-com:vml"
     xmlns:o="urn:schemas-microsoft-com:office:office">
@@ -820,11 +838,10 @@ def _validate_booking_payload(data, require_confirmation_no=True, default_curren
     if not status:
         return None, {"success": False, "error": "status is required"}
     status = str(status)
-    valid_statuses = ["confirmed", "cancelled", "pending", "completed"]
-    if status.lower() not in valid_statuses:
+    if status.lower() not in VALID_BOOKING_STATUSES:
         return None, {
             "success": False,
-            "error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            "error": f"Invalid status. Must be one of: {', '.join(VALID_BOOKING_STATUSES)}"
         }
 
     # Validate hotel object
@@ -930,19 +947,17 @@ def _update_cart_status(request_booking_name, mapped_status):
         filters={"request_booking": request_booking_name},
         pluck="name"
     )
-    room_status_map = {
-        "confirmed":  "booking_success",
-        "cancelled":  "booking_failure",
-        "pending":    "payment_pending",
-        "completed":  "booking_success"
-    }
-    new_room_status = room_status_map.get(mapped_status, "payment_pending")
-    for cart_hotel_item_name in cart_hotel_items_list:
-        cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_item_name)
-        for room in cart_hotel.rooms:
-            if room.status in ["approved", "payment_pending"]:
-                room.status = new_room_status
-        cart_hotel.save(ignore_permissions=True)
+    new_room_status = BOOKING_TO_ROOM_STATUS_MAP.get(mapped_status, "payment_pending")
+    if not cart_hotel_items_list:
+        return
+    # Status-only change: update the matching rooms in place instead of saving each hotel
+    room_names = frappe.get_all(
+        "Cart Hotel Room",
+        filters={"parent": ["in", cart_hotel_items_list], "status": ["in", ["approved", "payment_pending"]]},
+        pluck="name"
+    )
+    if room_names:
+        frappe.db.set_value("Cart Hotel Room", {"name": ["in", room_names]}, "status", new_room_status)
 
 
 def _fetch_request_booking(client_reference):
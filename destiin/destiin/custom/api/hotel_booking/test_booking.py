@@ -8,11 +8,104 @@ Or run specific test:
     bench --site <site-name> run-tests --module destiin.destiin.custom.api.hotel_booking.test_booking --test TestCreateBooking
 """
 
+import contextlib
+import functools
+
 import frappe
 from frappe.tests import IntegrationTestCase
 from unittest.mock import patch, MagicMock
 import json
 
+from destiin.destiin.custom.api.hotel_booking.booking import create_booking
+from destiin.destiin.custom.api.request_booking.request import approve_booking, store_req_booking
+
+
+# Company and employee (employee_name, first_name, last_name, company) created by each test class
+_TEST_COMPANIES = ("_Test Company Shared",)
+_TEST_EMPLOYEES = (
+    ("_Test-Employee-Shared", "Test", "Shared", "_Test Company Shared"),
+)
+
+@contextlib.contextmanager
+def form_dict_ctx(payload):
+    """Install payload as frappe.form_dict for the block, restoring the previous one on exit"""
+    prev = frappe.form_dict
+    frappe.form_dict = payload if isinstance(payload, frappe._dict) else frappe._dict(payload)
+    try:
+        yield
+    finally:
+        frappe.form_dict = prev
+
+
+# Single-room hotel used by _create_new_approved_booking, serialized once at import
+_CREATE_HOTEL_DETAILS_JSON = json.dumps({
+    "hotel_id": "HTL_CREATE_001",
+    "hotel_name": "Create Test Hotel",
+    "supplier": "Direct",
+    "cancellation_policy": "Flexible",
+    "meal_plan": "Room Only",
+    "rooms": [
+        {
+            "room_id": "RM_CREATE_001",
+            "room_name": "Standard Room",
+            "price": 3000,
+            "total_price": 3300,
+            "tax": 300,
+            "currency": "USD"
+        }
+    ]
+})
+_CREATE_SELECTED_ITEMS = [{"hotel_id": "HTL_CREATE_001", "room_ids": ["RM_CREATE_001"]}]
+_CREATE_SELECTED_ITEMS_JSON = json.dumps(_CREATE_SELECTED_ITEMS)
+
+# Keys every successful create_booking response must carry
+EXPECTED_BOOKING_FIELDS = frozenset({
+    "hotel_booking_id",
+    "booking_id",
+    "payment_id",
+    "booking_status",
+    "payment_status"
+})
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_fixtures(company_names, employee_specs):
+    """Create missing test companies/employees, checking existence with one query per doctype"""
+    existing_companies = set(frappe.get_all(
+        "Company", filters={"name": ("in", list(company_names))}, pluck="name"
+    ))
+    for company_name in company_names:
+        if company_name not in existing_companies:
+            frappe.get_doc({
+                "doctype": "Company",
+                "company_name": company_name,
+                "default_currency": "USD",
+                "country": "India"
+            }).insert(ignore_permissions=True)
+    names = {company_name: company_name for company_name in company_names}
+
+    existing_employees = frappe.get_all(
+        "Employee",
+        filters={"employee_name": ("in", [spec[0] for spec in employee_specs])},
+        fields=["name", "employee_name"]
+    )
+    names.update({row.employee_name: row.name for row in existing_employees})
+    for employee_id, first_name, last_name, company in employee_specs:
+        if employee_id not in names:
+            employee = frappe.get_doc({
+                "doctype": "Employee",
+                "employee_name": employee_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "company": company,
+                "gender": "Male",
+                "date_of_birth": "1990-01-01",
+                "date_of_joining": "2020-01-01"
+            })
+            employee.insert(ignore_permissions=True)
+            names[employee_id] = employee.name
+    return names
+
 
 class TestCreateBooking(IntegrationTestCase):
     """Test cases for create_booking API"""
@@ -20,8 +113,13 @@ class TestCreateBooking(IntegrationTestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        cls.test_company = cls._create_test_company()
-        cls.test_employee = cls._create_test_employee(cls.test_company)
+        # Created after the base class commit, so the class rollback removes them again
+        names = _ensure_fixtures(_TEST_COMPANIES, _TEST_EMPLOYEES)
+        cls.test_company = names["_Test Company Shared"]
+        cls.test_employee = names["_Test-Employee-Shared"]
+        # Fields shared by every form_dict payload; tests merge their own on top
+        cls.BASE_PAYLOAD = {"employee": cls.test_employee}
+        cls.STORE_PAYLOAD = {**cls.BASE_PAYLOAD, "company": cls.test_company}
         # Create an approved request booking for testing
         cls.approved_booking_id = cls._create_approved_request_booking(
             cls.test_employee, cls.test_company
@@ -29,47 +127,13 @@ class TestCreateBooking(IntegrationTestCase):
 
     @classmethod
     def tearDownClass(cls):
-        frappe.db.rollback()
+        # The class rollback discards the fixtures, so drop their cached names too
+        _ensure_fixtures.cache_clear()
         super().tearDownClass()
 
-    @classmethod
-    def _create_test_company(cls):
-        """Create a test company"""
-        company_name = "_Test Company Hotel Booking"
-        if not frappe.db.exists("Company", company_name):
-            company = frappe.get_doc({
-                "doctype": "Company",
-                "company_name": company_name,
-                "default_currency": "USD",
-                "country": "India"
-            })
-            company.insert(ignore_permissions=True)
-            return company.name
-        return company_name
-
-    @classmethod
-    def _create_test_employee(cls, company):
-        """Create a test employee"""
-        employee_id = "_Test-Employee-Hotel"
-        if not frappe.db.exists("Employee", {"employee_name": employee_id}):
-            employee = frappe.get_doc({
-                "doctype": "Employee",
-                "employee_name": employee_id,
-                "first_name": "Test",
-                "last_name": "Hotel",
-                "company": company,
-                "gender": "Male",
-                "date_of_birth": "1990-01-01",
-                "date_of_joining": "2020-01-01"
-            })
-            employee.insert(ignore_permissions=True)
-            return employee.name
-        return frappe.db.get_value("Employee", {"employee_name": employee_id}, "name")
-
     @classmethod
     def _create_approved_request_booking(cls, employee, company):
         """Create a request booking with approved rooms"""
-        from destiin.destiin.custom.api.request_booking.request import store_req_booking, approve_booking
 
         hotel_details = {
             "hotel_id": "HTL_HOTEL_001",
@@ -98,7 +162,7 @@ class TestCreateBooking(IntegrationTestCase):
         }
 
         # Create the request booking
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx({
             "employee": employee,
             "check_in": "2026-10-01",
             "check_out": "2026-10-05",
@@ -108,13 +172,12 @@ class TestCreateBooking(IntegrationTestCase):
             "child_count": 0,
             "room_count": 2,
             "hotel_details": hotel_details
-        })
-
-        result = store_req_booking()
+        }):
+            result = store_req_booking()
         booking_id = result["response"]["data"]["request_booking_id"]
 
         # Approve the booking
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx({
             "request_booking_id": booking_id,
             "employee": employee,
             "selected_items": [
@@ -123,31 +186,22 @@ class TestCreateBooking(IntegrationTestCase):
                     "room_ids": ["RM_HTL_001", "RM_HTL_002"]
                 }
             ]
-        })
-
-        approve_booking()
+        }):
+            approve_booking()
 
         return booking_id
 
     def test_create_booking_success(self):
         """Test creating a hotel booking from an approved request booking"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
         # Create a new approved booking for this test
         new_booking_id = self._create_new_approved_booking("2026-11-01", "2026-11-05")
 
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": new_booking_id,
-            "employee": self.test_employee,
-            "selected_items": json.dumps([
-                {
-                    "hotel_id": "HTL_CREATE_001",
-                    "room_ids": ["RM_CREATE_001"]
-                }
-            ])
-        })
-
-        result = create_booking()
+            "selected_items": _CREATE_SELECTED_ITEMS_JSON
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
         if result["response"]["success"]:
@@ -158,180 +212,113 @@ class TestCreateBooking(IntegrationTestCase):
 
     def _create_new_approved_booking(self, check_in, check_out):
         """Helper to create a new approved booking"""
-        from destiin.destiin.custom.api.request_booking.request import store_req_booking, approve_booking
-
-        hotel_details = {
-            "hotel_id": "HTL_CREATE_001",
-            "hotel_name": "Create Test Hotel",
-            "supplier": "Direct",
-            "cancellation_policy": "Flexible",
-            "meal_plan": "Room Only",
-            "rooms": [
-                {
-                    "room_id": "RM_CREATE_001",
-                    "room_name": "Standard Room",
-                    "price": 3000,
-                    "total_price": 3300,
-                    "tax": 300,
-                    "currency": "USD"
-                }
-            ]
-        }
 
-        frappe.form_dict = frappe._dict({
-            "employee": self.test_employee,
+        with form_dict_ctx(self.STORE_PAYLOAD | {
             "check_in": check_in,
             "check_out": check_out,
-            "company": self.test_company,
-            "hotel_details": hotel_details
-        })
-
-        result = store_req_booking()
+            "hotel_details": _CREATE_HOTEL_DETAILS_JSON
+        }):
+            result = store_req_booking()
         booking_id = result["response"]["data"]["request_booking_id"]
 
         # Approve it
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
-            "selected_items": [
-                {
-                    "hotel_id": "HTL_CREATE_001",
-                    "room_ids": ["RM_CREATE_001"]
-                }
-            ]
-        })
-        approve_booking()
+            "selected_items": _CREATE_SELECTED_ITEMS
+        }):
+            approve_booking()
 
         return booking_id
 
     def test_create_booking_with_selected_items_as_list(self):
         """Test create_booking with selected_items as list instead of JSON"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
-
-        new_booking_id = self._create_new_approved_booking("2026-11-10", "2026-11-15")
 
-        frappe.form_dict = frappe._dict({
-            "request_booking_id": new_booking_id,
-            "employee": self.test_employee,
+        # The class booking is only otherwise used by validation tests that fail before booking
+        with form_dict_ctx(self.BASE_PAYLOAD | {
+            "request_booking_id": self.approved_booking_id,
             "selected_items": [
                 {
-                    "hotel_id": "HTL_CREATE_001",
-                    "room_ids": ["RM_CREATE_001"]
+                    "hotel_id": "HTL_HOTEL_001",
+                    "room_ids": ["RM_HTL_001", "RM_HTL_002"]
                 }
             ]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
 
     def test_create_booking_missing_request_booking_id(self):
         """Test create_booking without request_booking_id"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
-        frappe.form_dict = frappe._dict({
-            "employee": self.test_employee,
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "selected_items": [{"hotel_id": "HTL001", "room_ids": ["RM001"]}]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
         # Should handle missing booking ID gracefully
 
     def test_create_booking_missing_employee(self):
         """Test create_booking without employee"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx({
             "request_booking_id": self.approved_booking_id,
             "selected_items": [{"hotel_id": "HTL001", "room_ids": ["RM001"]}]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
 
     def test_create_booking_nonexistent_request_booking(self):
         """Test create_booking with non-existent request booking"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": "NONEXISTENT_BOOKING_XYZ",
-            "employee": self.test_employee,
             "selected_items": [{"hotel_id": "HTL001", "room_ids": ["RM001"]}]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
         # Should fail for non-existent booking
 
     def test_create_booking_duplicate_prevention(self):
         """Test that duplicate hotel bookings are prevented"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
         # Create a booking first
         new_booking_id = self._create_new_approved_booking("2026-12-01", "2026-12-05")
 
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": new_booking_id,
-            "employee": self.test_employee,
-            "selected_items": [
-                {
-                    "hotel_id": "HTL_CREATE_001",
-                    "room_ids": ["RM_CREATE_001"]
-                }
-            ]
-        })
+            "selected_items": _CREATE_SELECTED_ITEMS
+        }):
+            # First call should succeed
+            result1 = create_booking()
 
-        # First call should succeed
-        result1 = create_booking()
-
-        if result1["response"]["success"]:
-            # Second call with same booking should fail or handle gracefully
-            result2 = create_booking()
-            self.assertIn("response", result2)
+            if result1["response"]["success"]:
+                # Second call with same booking should fail or handle gracefully
+                result2 = create_booking()
+                self.assertIn("response", result2)
 
     def test_create_booking_response_structure(self):
         """Test that response has correct structure"""
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
         new_booking_id = self._create_new_approved_booking("2026-12-10", "2026-12-15")
 
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": new_booking_id,
-            "employee": self.test_employee,
-            "selected_items": [
-                {
-                    "hotel_id": "HTL_CREATE_001",
-                    "room_ids": ["RM_CREATE_001"]
-                }
-            ]
-        })
-
-        result = create_booking()
+            "selected_items": _CREATE_SELECTED_ITEMS
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
         response = result["response"]
         self.assertIn("success", response)
 
         if response["success"]:
-            data = response["data"]
-            expected_fields = [
-                "hotel_booking_id",
-                "booking_id",
-                "payment_id",
-                "booking_status",
-                "payment_status"
-            ]
-            for field in expected_fields:
-                self.assertIn(field, data)
+            self.assertGreaterEqual(response["data"].keys(), EXPECTED_BOOKING_FIELDS)
 
     def test_create_booking_only_approved_rooms(self):
         """Test that only approved rooms are included in the booking"""
-        from destiin.destiin.custom.api.request_booking.request import store_req_booking
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
         # Create booking with multiple rooms but only approve some
         hotel_details = {
@@ -360,44 +347,37 @@ class TestCreateBooking(IntegrationTestCase):
             ]
         }
 
-        frappe.form_dict = frappe._dict({
-            "employee": self.test_employee,
+        with form_dict_ctx(self.STORE_PAYLOAD | {
             "check_in": "2026-12-20",
             "check_out": "2026-12-25",
-            "company": self.test_company,
             "hotel_details": hotel_details
-        })
-
-        result = store_req_booking()
+        }):
+            result = store_req_booking()
         booking_id = result["response"]["data"]["request_booking_id"]
 
         # Approve only one room
-        from destiin.destiin.custom.api.request_booking.request import approve_booking
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
             "selected_items": [
                 {
                     "hotel_id": "HTL_PARTIAL_001",
                     "room_ids": ["RM_PARTIAL_001"]  # Only approve first room
                 }
             ]
-        })
-        approve_booking()
+        }):
+            approve_booking()
 
         # Create booking - should only include approved room
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
             "selected_items": [
                 {
                     "hotel_id": "HTL_PARTIAL_001",
                     "room_ids": ["RM_PARTIAL_001"]
                 }
             ]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
         self.assertIn("response", result)
 
 
@@ -407,50 +387,22 @@ class TestCreateBookingWithMultipleRooms(IntegrationTestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        cls.test_company = cls._create_test_company()
-        cls.test_employee = cls._create_test_employee(cls.test_company)
+        # Created after the base class commit, so the class rollback removes them again
+        names = _ensure_fixtures(_TEST_COMPANIES, _TEST_EMPLOYEES)
+        cls.test_company = names["_Test Company Shared"]
+        cls.test_employee = names["_Test-Employee-Shared"]
+        # Fields shared by every form_dict payload; tests merge their own on top
+        cls.BASE_PAYLOAD = {"employee": cls.test_employee}
+        cls.STORE_PAYLOAD = {**cls.BASE_PAYLOAD, "company": cls.test_company}
 
     @classmethod
     def tearDownClass(cls):
-        frappe.db.rollback()
+        # The class rollback discards the fixtures, so drop their cached names too
+        _ensure_fixtures.cache_clear()
         super().tearDownClass()
 
-    @classmethod
-    def _create_test_company(cls):
-        company_name = "_Test Company Multi Room"
-        if not frappe.db.exists("Company", company_name):
-            company = frappe.get_doc({
-                "doctype": "Company",
-                "company_name": company_name,
-                "default_currency": "USD",
-                "country": "India"
-            })
-            company.insert(ignore_permissions=True)
-            return company.name
-        return company_name
-
-    @classmethod
-    def _create_test_employee(cls, company):
-        employee_id = "_Test-Employee-Multi"
-        if not frappe.db.exists("Employee", {"employee_name": employee_id}):
-            employee = frappe.get_doc({
-                "doctype": "Employee",
-                "employee_name": employee_id,
-                "first_name": "Test",
-                "last_name": "Multi",
-                "company": company,
-                "gender": "Male",
-                "date_of_birth": "1990-01-01",
-                "date_of_joining": "2020-01-01"
-            })
-            employee.insert(ignore_permissions=True)
-            return employee.name
-        return frappe.db.get_value("Employee", {"employee_name": employee_id}, "name")
-
     def test_create_booking_multiple_rooms(self):
         """Test creating a booking with multiple rooms"""
-        from destiin.destiin.custom.api.request_booking.request import store_req_booking, approve_booking
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
         hotel_details = {
             "hotel_id": "HTL_MULTI_001",
@@ -487,44 +439,38 @@ class TestCreateBookingWithMultipleRooms(IntegrationTestCase):
         }
 
         # Create booking
-        frappe.form_dict = frappe._dict({
-            "employee": self.test_employee,
+        with form_dict_ctx(self.STORE_PAYLOAD | {
             "check_in": "2027-01-01",
             "check_out": "2027-01-05",
-            "company": self.test_company,
             "room_count": 3,
             "hotel_details": hotel_details
-        })
-
-        result = store_req_booking()
+        }):
+            result = store_req_booking()
         booking_id = result["response"]["data"]["request_booking_id"]
 
         # Approve all rooms
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
             "selected_items": [
                 {
                     "hotel_id": "HTL_MULTI_001",
                     "room_ids": ["RM_MULTI_001", "RM_MULTI_002", "RM_MULTI_003"]
                 }
             ]
-        })
-        approve_booking()
+        }):
+            approve_booking()
 
         # Create hotel booking
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
             "selected_items": [
                 {
                     "hotel_id": "HTL_MULTI_001",
                     "room_ids": ["RM_MULTI_001", "RM_MULTI_002", "RM_MULTI_003"]
                 }
             ]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
         if result["response"]["success"]:
@@ -535,8 +481,6 @@ class TestCreateBookingWithMultipleRooms(IntegrationTestCase):
 
     def test_create_booking_calculates_correct_total(self):
         """Test that total amount is calculated correctly"""
-        from destiin.destiin.custom.api.request_booking.request import store_req_booking, approve_booking
-        from destiin.destiin.custom.api.hotel_booking.booking import create_booking
 
         hotel_details = {
             "hotel_id": "HTL_CALC_001",
@@ -564,43 +508,37 @@ class TestCreateBookingWithMultipleRooms(IntegrationTestCase):
             ]
         }
 
-        frappe.form_dict = frappe._dict({
-            "employee": self.test_employee,
+        with form_dict_ctx(self.STORE_PAYLOAD | {
             "check_in": "2027-02-01",
             "check_out": "2027-02-05",
-            "company": self.test_company,
             "hotel_details": hotel_details
-        })
-
-        result = store_req_booking()
+        }):
+            result = store_req_booking()
         booking_id = result["response"]["data"]["request_booking_id"]
 
         # Approve
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
             "selected_items": [
                 {
                     "hotel_id": "HTL_CALC_001",
                     "room_ids": ["RM_CALC_001", "RM_CALC_002"]
                 }
             ]
-        })
-        approve_booking()
+        }):
+            approve_booking()
 
         # Create booking
-        frappe.form_dict = frappe._dict({
+        with form_dict_ctx(self.BASE_PAYLOAD | {
             "request_booking_id": booking_id,
-            "employee": self.test_employee,
             "selected_items": [
                 {
                     "hotel_id": "HTL_CALC_001",
                     "room_ids": ["RM_CALC_001", "RM_CALC_002"]
                 }
             ]
-        })
-
-        result = create_booking()
+        }):
+            result = create_booking()
 
         self.assertIn("response", result)
         if result["response"]["success"]:
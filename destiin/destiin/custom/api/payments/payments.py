@@ -2,6 +2,7 @@ import frappe
 import json
 import requests
 from datetime import timedelta, datetime, timezone
+from markupsafe import escape
 from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
 from destiin.destiin.constants import EMAIL_API_URL, HITPAY_CREATE_PAYMENT_URL
 
@@ -25,6 +26,9 @@ PAYMENT_TO_REQUEST_STATUS_MAP = {
     "payment_refunded": "request_closed",
 }
 
+# Room statuses counted towards a payment once the room has been approved
+PAYABLE_ROOM_STATUSES = ("approved", "payment_pending", "payment_success", "payment_failure", "booking_success")
+
 
 # ─── Private Helpers ──────────────────────────────────────────────────────────
 
@@ -89,12 +93,14 @@ def _update_cart_and_request_status(request_booking_link, new_cart_status, new_r
     )
 
     if chi_names:
-        for chi_name in chi_names:
-            chi_doc = frappe.get_doc("Cart Hotel Item", chi_name)
-            for room in chi_doc.rooms:
-                if room.status in filter_statuses:
-                    room.status = new_cart_status
-            chi_doc.save(ignore_permissions=True)
+        # Status-only change: update the matching rooms in place instead of saving each hotel
+        room_names = frappe.get_all(
+            "Cart Hotel Room",
+            filters={"parent": ["in", chi_names], "status": ["in", filter_statuses]},
+            pluck="name",
+        )
+        if room_names:
+            frappe.db.set_value("Cart Hotel Room", {"name": ["in", room_names]}, "status", new_cart_status)
 
         update_request_status_from_rooms(request_booking_link)
 
@@ -142,6 +148,12 @@ def send_payment_email(to_emails, payment_url, hotel_name, amount, currency, emp
     fallback_subject = f"Payment Link for Hotel Booking - {hotel_name}"
     subject = email_subject or fallback_subject
 
+    # Escape caller-supplied text once so guest, hotel and agent values cannot inject markup
+    (employee_name, hotel_name, room_type, check_in, check_out, currency, payment_url, agent_email) = (
+        escape(value) if value else value
+        for value in (employee_name, hotel_name, room_type, check_in, check_out, currency, payment_url, agent_email)
+    )
+
     body = f"""<!DOCTYPE html>
 <html lang="en" xmlns="http://www.w3.org/1999/xhtml" xmlns:v="urn:schemas-microsoft-com:vml"
     xmlns:o="urn:schemas-microsoft-com:office:office">
@@ -631,7 +643,6 @@ def create_payment_url(request_booking_id, mode=None):
                             "payment_status", "payment_expired"
                         )
                     _update_request_booking_doc(request_booking_name, {"payment_status": "payment_expired"})
-                    frappe.db.commit()
 
             if not is_expired:
                 existing_payment_url = ""
@@ -694,7 +705,10 @@ def create_payment_url(request_booking_id, mode=None):
             # (booking_id has a unique constraint on Booking Payments)
             if existing_payment_doc.booking_id:
                 frappe.db.set_value("Booking Payments", existing_payment_doc.name, "booking_id", None)
-                frappe.db.commit()
+
+            # Commit the expiry and cleanup now so these rows are not locked through the
+            # HitPay call, and stay saved if a later step returns early
+            frappe.db.commit()
 
             # Expired → reload and fall through to create a new payment
             request_booking = frappe.get_doc("Request Booking Details", request_booking_name)
@@ -712,22 +726,46 @@ def create_payment_url(request_booking_id, mode=None):
         if not cart_hotel_item_names:
             return {"success": False, "error": "No Cart Hotel Item linked to this Request Booking"}
 
-        approved_rooms = []
-        cart_hotel = None
-        for chi_name in cart_hotel_item_names:
-            chi_doc = frappe.get_doc("Cart Hotel Item", chi_name)
-            if not cart_hotel:
-                cart_hotel = chi_doc
-            for room in chi_doc.rooms:
-                if room.status in ["approved", "payment_pending", "payment_success", "payment_failure", "booking_success"]:
-                    approved_rooms.append(room)
-
-        if not approved_rooms:
+        # Let the database count and total the approved rooms per hotel instead of
+        # loading every Cart Hotel Item with all of its child rows
+        room_totals = {
+            row.parent: row
+            for row in frappe.db.sql(
+                """
+                SELECT parent,
+                       COUNT(*) AS room_count,
+                       SUM(COALESCE(NULLIF(total_price, 0), price, 0)) AS total_amount,
+                       SUM(COALESCE(tax, 0)) AS total_tax
+                FROM `tabCart Hotel Room`
+                WHERE parenttype = 'Cart Hotel Item'
+                  AND parent IN %(parents)s
+                  AND status IN %(statuses)s
+                GROUP BY parent
+                """,
+                {"parents": tuple(cart_hotel_item_names), "statuses": PAYABLE_ROOM_STATUSES},
+                as_dict=True,
+            )
+        }
+
+        if not room_totals:
             return {"success": False, "error": "No approved rooms found in Cart Hotel Item"}
 
-        total_amount = sum(float(room.total_price or room.price or 0) for room in approved_rooms)
-        total_tax = sum(float(room.tax or 0) for room in approved_rooms)
-        currency = approved_rooms[0].currency if approved_rooms[0].currency else "USD"
+        room_count = sum(row.room_count for row in room_totals.values())
+        total_amount = sum(float(row.total_amount or 0) for row in room_totals.values())
+        total_tax = sum(float(row.total_tax or 0) for row in room_totals.values())
+
+        cart_hotel = frappe.db.get_value(
+            "Cart Hotel Item", cart_hotel_item_names[0], ["hotel_id", "hotel_name"], as_dict=True
+        )
+        first_room_parent = next(n for n in cart_hotel_item_names if n in room_totals)
+        first_room = frappe.db.get_value(
+            "Cart Hotel Room",
+            {"parent": first_room_parent, "parenttype": "Cart Hotel Item", "status": ["in", PAYABLE_ROOM_STATUSES]},
+            ["room_name", "currency"],
+            as_dict=True,
+            order_by="idx asc",
+        )
+        currency = first_room.currency if first_room.currency else "USD"
         amount = total_amount + total_tax
 
         if amount <= 0:
@@ -740,7 +778,7 @@ def create_payment_url(request_booking_id, mode=None):
         payment_doc.company = request_booking.company
         payment_doc.hotel_id = cart_hotel.hotel_id
         payment_doc.hotel_name = cart_hotel.hotel_name
-        payment_doc.room_count = len(approved_rooms)
+        payment_doc.room_count = room_count
         payment_doc.check_in = request_booking.check_in
         payment_doc.check_out = request_booking.check_out
         payment_doc.occupancy = request_booking.occupancy
@@ -862,7 +900,7 @@ def create_payment_url(request_booking_id, mode=None):
         frappe.db.commit()
 
         # ── Send email notification ───────────────────────────────────────────
-        room_type = approved_rooms[0].room_name if approved_rooms else ""
+        room_type = first_room.room_name or ""
         email_sent, email_recipients = _send_payment_notification(
             employee_email, agent_email,
             payment_url=payment_url,
@@ -890,7 +928,7 @@ def create_payment_url(request_booking_id, mode=None):
                 "currency": currency,
                 "hotel_id": cart_hotel.hotel_id,
                 "hotel_name": cart_hotel.hotel_name,
-                "room_count": len(approved_rooms),
+                "room_count": room_count,
                 "total_amount": total_amount,
                 "tax": total_tax,
                 "employee_name": employee_name,
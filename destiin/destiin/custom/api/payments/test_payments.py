@@ -14,6 +14,47 @@ from unittest.mock import patch, MagicMock
 import json
 
 
+# Keys every successful create_payment_url response must carry
+EXPECTED_PAYMENT_URL_FIELDS = frozenset({
+    "payment_url",
+    "amount",
+    "currency",
+    "payment_status"
+})
+
+# Employees used by the test classes: employee_name -> Employee document name,
+# prefetched with one query in setUpModule and extended as missing ones are created
+_TEST_EMPLOYEE_IDS = ("_Test-Employee-Payments", "_Test-Employee-Amount")
+EMPLOYEE_NAMES = {}
+
+
+def _insert_test_company(company_name):
+    """Create a test company unless it exists"""
+    if not frappe.db.exists("Company", company_name):
+        company = frappe.get_doc({
+            "doctype": "Company",
+            "company_name": company_name,
+            "default_currency": "USD",
+            "country": "India"
+        })
+        company.insert(ignore_permissions=True)
+        return company.name
+    return company_name
+
+
+def setUpModule():
+    rows = frappe.get_all(
+        "Employee",
+        filters={"employee_name": ("in", _TEST_EMPLOYEE_IDS)},
+        fields=["name", "employee_name"]
+    )
+    EMPLOYEE_NAMES.update({row.employee_name: row.name for row in rows})
+
+
+def tearDownModule():
+    EMPLOYEE_NAMES.clear()
+
+
 class TestCreatePaymentUrl(IntegrationTestCase):
     """Test cases for create_payment_url API"""
 
@@ -34,23 +75,13 @@ class TestCreatePaymentUrl(IntegrationTestCase):
     @classmethod
     def _create_test_company(cls):
         """Create a test company"""
-        company_name = "_Test Company Payments"
-        if not frappe.db.exists("Company", company_name):
-            company = frappe.get_doc({
-                "doctype": "Company",
-                "company_name": company_name,
-                "default_currency": "USD",
-                "country": "India"
-            })
-            company.insert(ignore_permissions=True)
-            return company.name
-        return company_name
+        return _insert_test_company("_Test Company Payments")
 
     @classmethod
     def _create_test_employee(cls, company):
         """Create a test employee with email"""
         employee_id = "_Test-Employee-Payments"
-        if not frappe.db.exists("Employee", {"employee_name": employee_id}):
+        if employee_id not in EMPLOYEE_NAMES:
             # First create a user for the employee
             user_email = "test_payment_employee@test.com"
             if not frappe.db.exists("User", user_email):
@@ -77,8 +108,8 @@ class TestCreatePaymentUrl(IntegrationTestCase):
                 "cell_number": "9876543210"
             })
             employee.insert(ignore_permissions=True)
-            return employee.name
-        return frappe.db.get_value("Employee", {"employee_name": employee_id}, "name")
+            EMPLOYEE_NAMES[employee_id] = employee.name
+        return EMPLOYEE_NAMES[employee_id]
 
     @classmethod
     def _create_test_booking_payment(cls, employee, company):
@@ -200,15 +231,7 @@ class TestCreatePaymentUrl(IntegrationTestCase):
             self.assertIn("success", response)
 
             if response["success"]:
-                data = response["data"]
-                expected_fields = [
-                    "payment_url",
-                    "amount",
-                    "currency",
-                    "payment_status"
-                ]
-                for field in expected_fields:
-                    self.assertIn(field, data)
+                self.assertGreaterEqual(response["data"].keys(), EXPECTED_PAYMENT_URL_FIELDS)
 
     def test_create_payment_url_missing_payment_id(self):
         """Test create_payment_url without payment_id"""
@@ -321,22 +344,12 @@ class TestCreatePaymentUrlWithDifferentAmounts(IntegrationTestCase):
 
     @classmethod
     def _create_test_company(cls):
-        company_name = "_Test Company Amount"
-        if not frappe.db.exists("Company", company_name):
-            company = frappe.get_doc({
-                "doctype": "Company",
-                "company_name": company_name,
-                "default_currency": "USD",
-                "country": "India"
-            })
-            company.insert(ignore_permissions=True)
-            return company.name
-        return company_name
+        return _insert_test_company("_Test Company Amount")
 
     @classmethod
     def _create_test_employee(cls, company):
         employee_id = "_Test-Employee-Amount"
-        if not frappe.db.exists("Employee", {"employee_name": employee_id}):
+        if employee_id not in EMPLOYEE_NAMES:
             user_email = "test_amount_employee@test.com"
             if not frappe.db.exists("User", user_email):
                 user = frappe.get_doc({
@@ -362,8 +375,8 @@ class TestCreatePaymentUrlWithDifferentAmounts(IntegrationTestCase):
                 "cell_number": "9876543210"
             })
             employee.insert(ignore_permissions=True)
-            return employee.name
-        return frappe.db.get_value("Employee", {"employee_name": employee_id}, "name")
+            EMPLOYEE_NAMES[employee_id] = employee.name
+        return EMPLOYEE_NAMES[employee_id]
 
     def _create_booking_with_amount(self, price, tax, check_in, check_out):
         """Helper to create booking with specific amount"""
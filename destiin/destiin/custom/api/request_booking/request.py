@@ -1,10 +1,12 @@
 import frappe
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import uuid
 from datetime import datetime
 from collections import defaultdict
-from frappe.utils import getdate
+from frappe.utils import flt, getdate
 from urllib.parse import unquote
 from urllib.parse import quote_plus
 from destiin.destiin.constants import EMAIL_AUTH_TOKEN_URL, TASKS_EMAIL_API_URL, POLICY_DIEM_ACCOMMODATION_URL, CURRENCY_CONVERT_URL, PERDIEM_RATE_URL
@@ -14,6 +16,13 @@ RECOMMEND_API_URL = "http://16.112.56.253/email/recommend"
 
 EMAIL_AUTHENTICATION_API_URL = EMAIL_AUTH_TOKEN_URL
 
+# Pooled keep-alive session shared by every outbound API call in this module, so
+# repeated calls to the same host reuse a connection instead of opening a new one
+_api_session = requests.Session()
+_api_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=Retry(total=2, backoff_factor=0.3))
+_api_session.mount("http://", _api_adapter)
+_api_session.mount("https://", _api_adapter)
+
 
 def get_hotel_reviews_url(hotel_reviews, hotel_name, destination):
 	"""Return hotel_reviews if it has a value, otherwise construct a Google search URL."""
@@ -48,6 +57,60 @@ REQUEST_STATUS_DISPLAY_MAP = {
 	"request_closed": ("closed", 5)
 }
 
+# Room status → request status, checked in priority order by update_request_status_from_rooms
+ROOM_STATUS_PRIORITY = (
+	("payment_success", "req_payment_success"),
+	("payment_pending", "req_payment_pending"),
+	("booking_success", "request_closed"),
+	("approved", "approval_received"),
+	("sent_for_approval", "offer_sent"),
+	("waiting_for_approval", "offer_sent"),
+)
+
+# Request status → the room status shown for it by get_request_booking_details
+REQUEST_TO_ROOM_STATUS_MAP = {
+	"offer_sent": "sent_for_approval",
+	"approval_received": "approved",
+	"req_payment_pending": "payment_pending",
+	"req_payment_success": "payment_success",
+}
+
+# Same for the list API, which shows every room while an offer is still out
+LIST_REQUEST_TO_ROOM_STATUS_MAP = {
+	"approval_received": "approved",
+	"req_payment_pending": "payment_pending",
+	"req_payment_success": "payment_success",
+}
+
+# Valid options for the Request Booking Details Select fields
+VALID_REQUEST_STATUS = frozenset({
+	"open_request", "offer_pending", "offer_sent",
+	"approval_received", "request_closed", "void"
+})
+VALID_PAYMENT_STATUS = frozenset({
+	"payment_pending", "payment_failure", "payment_success",
+	"payment_declined", "payment_awaiting", "payment_cancel",
+	"payment_expired", "payment_refunded"
+})
+VALID_BUDGET_OPTIONS = frozenset({"fixed", "actuals"})
+VALID_AUTOMATION_STATUS = frozenset({"ACTIVE", "PAUSED"})
+
+# Valid options for the Cart Hotel Room status Select field; rooms are bulk
+# inserted without the ORM, so _validate_hotel_rooms checks them up front
+VALID_ROOM_STATUS = frozenset({
+	"pending", "approved", "declined", "deleted", "sent_for_approval",
+	"waiting_for_approval", "booking_success", "booking_failure",
+	"booking_unavailable", "payment_pending", "payment_success",
+	"payment_failure", "payment_cancel"
+})
+
+# Upper bound on hotels accepted in one send_for_approval call
+MAX_SELECTED_ITEMS = 100
+
+# Fields read by the send / approve / decline / delete room APIs
+CART_HOTEL_SUMMARY_FIELDS = ["name", "hotel_id", "hotel_name", "supplier"]
+CART_ROOM_ACTION_FIELDS = ["name", "parent", "room_id", "room_rate_id", "room_name", "price"]
+
 
 def get_request_status_from_cart_status(cart_status):
     """
@@ -94,11 +157,14 @@ def update_request_status_from_rooms(request_booking_name, cart_hotel_item_name=
     if not cart_hotel_items:
         return None
 
-    # Collect all room statuses from all hotels
-    room_statuses = []
-    for cart_hotel_item in cart_hotel_items:
-        cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_item)
-        room_statuses.extend([room.status for room in cart_hotel.rooms if room.status])
+    # Collect the distinct room statuses from all hotels in one child-table query
+    room_statuses = {
+        status for status in frappe.get_all(
+            "Cart Hotel Room",
+            filters={"parent": ["in", cart_hotel_items], "parenttype": "Cart Hotel Item"},
+            pluck="status"
+        ) if status
+    }
 
     if not room_statuses:
         return None
@@ -107,26 +173,17 @@ def update_request_status_from_rooms(request_booking_name, cart_hotel_item_name=
     new_request_status = "offer_pending"
 
     # Priority: payment_success > payment_pending > booking_success > approved > sent_for_approval > declined > pending
-    status_priority = [
-        ("payment_success", "req_payment_success"),
-        ("payment_pending", "req_payment_pending"),
-        ("booking_success", "request_closed"),
-        ("approved", "approval_received"),
-        ("sent_for_approval", "offer_sent"),
-        ("waiting_for_approval", "offer_sent"),
-    ]
-
-    for cart_status, req_status in status_priority:
+    for cart_status, req_status in ROOM_STATUS_PRIORITY:
         if cart_status in room_statuses:
             new_request_status = req_status
             break
     else:
         # Check if all rooms are declined
-        if all(status == "declined" for status in room_statuses):
+        if room_statuses == {"declined"}:
             new_request_status = "offer_pending"
-        elif all(status == "booking_failure" for status in room_statuses):
+        elif room_statuses == {"booking_failure"}:
             new_request_status = "approval_received"
-        elif all(status == "booking_unavailable" for status in room_statuses):
+        elif room_statuses == {"booking_unavailable"}:
             new_request_status = "approval_received"
 
     # Update the request booking status
@@ -271,11 +328,13 @@ def get_or_create_employee(employee_id, company=None, employee_name=None, employ
 	Returns:
 		tuple: (employee_name, company_name, is_new_employee, custom_employee_id)
 	"""
-	# Check if employee exists by record ID (primary key)
-	if frappe.db.exists("Employee", employee_id):
-		employee_doc = frappe.get_doc("Employee", employee_id)
-		custom_emp_id = employee_doc.custom_employee_id or employee_doc.name
-		return employee_doc.name, employee_doc.company, False, custom_emp_id
+	# Check if employee exists by record ID (primary key); one query for just the needed fields
+	existing_employee = frappe.db.get_value(
+		"Employee", employee_id, ["name", "company", "custom_employee_id"], as_dict=True
+	)
+	if existing_employee:
+		custom_emp_id = existing_employee.custom_employee_id or existing_employee.name
+		return existing_employee.name, existing_employee.company, False, custom_emp_id
 
 	# Check if employee exists by email (if email provided)
 	# if employee_email:
@@ -358,7 +417,7 @@ def _get_company_display_name(company_id):
 	"""Fetch company display name."""
 	if not company_id:
 		return ""
-	return frappe.db.get_value("Company", company_id, "company_name") or ""
+	return frappe.get_cached_value("Company", company_id, "company_name") or ""
 
 
 def _get_hotel_booking_id(booking_link):
@@ -368,6 +427,126 @@ def _get_hotel_booking_id(booking_link):
 	return frappe.db.get_value("Hotel Bookings", booking_link, "booking_id") or "NA"
 
 
+def _replace_cart_hotel_item_links(request_booking_name, cart_hotel_item_names):
+	"""
+	Replace the cart_hotel_item Table MultiSelect rows of a Request Booking Details
+	with one DELETE and one bulk INSERT instead of a per-row insert on parent save.
+	Callers must reload() the parent doc before saving it again.
+	"""
+	frappe.db.delete("Cart Hotel Item Link", {
+		"parent": request_booking_name,
+		"parenttype": "Request Booking Details",
+		"parentfield": "cart_hotel_item"
+	})
+	if not cart_hotel_item_names:
+		return
+	now = frappe.utils.now()
+	user = frappe.session.user
+	frappe.db.bulk_insert(
+		"Cart Hotel Item Link",
+		fields=["name", "parent", "parenttype", "parentfield", "idx", "cart_hotel_item",
+		        "creation", "modified", "owner", "modified_by"],
+		values=[
+			(frappe.generate_hash(length=10), request_booking_name, "Request Booking Details",
+			 "cart_hotel_item", idx, item_name, now, now, user, user)
+			for idx, item_name in enumerate(cart_hotel_item_names, start=1)
+		]
+	)
+
+
+def _validate_hotel_rooms(hotels_list, check_status=True):
+	"""
+	Check the rooms of a hotel_details payload the way the Cart Hotel Room Select
+	and Currency link validation would, since _bulk_insert_cart_hotel_rooms skips it.
+	Returns an error message, or None when every room is valid.
+	"""
+	rooms = [
+		room for hotel in hotels_list if isinstance(hotel, dict)
+		for room in hotel.get("rooms") or []
+	]
+	if check_status:
+		invalid_statuses = sorted({
+			room["status"] for room in rooms
+			if room.get("status") and room["status"] not in VALID_ROOM_STATUS
+		})
+		if invalid_statuses:
+			return (
+				f"Invalid room status {', '.join(repr(s) for s in invalid_statuses)}. "
+				f"Valid values: {', '.join(sorted(VALID_ROOM_STATUS))}"
+			)
+
+	currencies = {room["currency"] for room in rooms if room.get("currency")}
+	if currencies:
+		invalid_currencies = sorted(currencies - set(frappe.get_all(
+			"Currency", filters={"name": ["in", list(currencies)]}, pluck="name"
+		)))
+		if invalid_currencies:
+			return f"Invalid room currency {', '.join(repr(c) for c in invalid_currencies)}"
+	return None
+
+
+def _bulk_insert_cart_hotel_rooms(rooms_by_item, status=None):
+	"""
+	Insert the rooms child rows of Cart Hotel Items with one bulk INSERT instead
+	of a per-row insert on each parent save. The items must have no rooms yet.
+	rooms_by_item is an iterable of (cart_hotel_item_name, rooms_data) pairs.
+	status forces every room to that status; when omitted each room keeps its
+	own status from the payload (default pending).
+	The rows skip document validation, so callers must check the payload with
+	_validate_hotel_rooms first.
+	"""
+	now = frappe.utils.now()
+	user = frappe.session.user
+	values = []
+	for item_name, rooms_data in rooms_by_item:
+		for idx, room in enumerate(rooms_data, start=1):
+			cp = room.get("cancellation_policy", [])
+			values.append((
+				frappe.generate_hash(length=10), item_name, "Cart Hotel Item", "rooms", idx,
+				room.get("room_id", ""), room.get("room_rate_id", ""), room.get("room_name", ""),
+				room.get("room_code", ""), flt(room.get("price", 0)), flt(room.get("total_price", 0)),
+				flt(room.get("tax", 0)), room.get("currency", "USD"), status or room.get("status", "pending"),
+				json.dumps(room.get("images", [])),
+				json.dumps(cp) if not isinstance(cp, str) else cp,
+				room.get("breakfast_type", ""), now, now, user, user
+			))
+	if not values:
+		return
+	frappe.db.bulk_insert(
+		"Cart Hotel Room",
+		fields=["name", "parent", "parenttype", "parentfield", "idx",
+		        "room_id", "room_rate_id", "room_name", "room_code", "price", "total_price",
+		        "tax", "currency", "status", "images", "cancellation_policy", "breakfast_type",
+		        "creation", "modified", "owner", "modified_by"],
+		values=values
+	)
+
+
+def _get_live_cart_hotels(request_names, fields):
+	"""
+	Return the Cart Hotel Items of the given requests that still have at least one
+	room that is neither deleted nor declined, newest first. Hotels the GET APIs
+	would drop anyway are filtered out by the database instead of in Python.
+	"""
+	columns = ", ".join(f"chi.`{field}`" for field in fields)
+	return frappe.db.sql(
+		f"""
+		SELECT {columns}
+		FROM `tabCart Hotel Item` chi
+		WHERE chi.request_booking IN %(request_names)s
+		  AND EXISTS (
+			SELECT 1 FROM `tabCart Hotel Room` chr
+			WHERE chr.parent = chi.name
+			  AND chr.parenttype = 'Cart Hotel Item'
+			  AND COALESCE(chr.status, '') NOT IN ('deleted', 'declined')
+		  )
+		ORDER BY chi.creation DESC
+		""",
+		{"request_names": tuple(request_names)},
+		as_dict=True
+	)
+
+
 def _build_booking_response_data(req, hotels, total_amount, employee_name,
                                   employee_phone, employee_level,
                                   company_name, booking_id):
@@ -451,7 +630,7 @@ def _call_tripadvisor_url_api(request_booking_id, hotels_data, destination, dest
 		frappe.logger("request_booking").info(
 			f"[TripAdvisor URL API] REQUEST - URL: {TRIPADVISOR_URL_API}, Payload: {json.dumps(payload)}"
 		)
-		resp = requests.post(
+		resp = _api_session.post(
 			TRIPADVISOR_URL_API,
 			headers={"Content-Type": "application/json"},
 			data=json.dumps(payload),
@@ -538,7 +717,7 @@ def _call_recommend_api(request_booking_id, destination_details, check_in, check
 			"Recommend API Request",
 			f"[Recommend API] REQUEST - URL: {RECOMMEND_API_URL}, Payload: {json.dumps(payload)}"
 		)
-		resp = requests.post(
+		resp = _api_session.post(
 			RECOMMEND_API_URL,
 			headers={"Content-Type": "application/json","info": "true"},
 			data=json.dumps(payload),
@@ -581,7 +760,7 @@ def _fetch_perdiem_rate(dest_country, city, employee_level):
 	try:
 		url = f"{PERDIEM_RATE_URL}?country={dest_country}&city={city}&level={employee_level}"
 		frappe.logger("request_booking").info(f"[Per Diem Rate API] REQUEST - URL: {url}")
-		resp = requests.get(url, headers={"info": "true"}, timeout=30)
+		resp = _api_session.get(url, headers={"info": "true"}, timeout=30)
 		frappe.logger("request_booking").info(
 			f"[Per Diem Rate API] RESPONSE - Status: {resp.status_code}, Body: {resp.text}"
 		)
@@ -609,7 +788,7 @@ def _convert_to_usd(amount, from_currency):
 	try:
 		url = f"{CURRENCY_CONVERT_URL}?amount={amount}&from={from_currency}&to=USD"
 		frappe.logger("request_booking").info(f"[Currency Convert API] REQUEST - URL: {url}")
-		resp = requests.get(
+		resp = _api_session.get(
 			url,
 			headers={"Content-Type": "application/json", "info": "true"},
 			timeout=30
@@ -686,7 +865,7 @@ def _convert_from_usd(amount, to_currency):
 	try:
 		url = f"{CURRENCY_CONVERT_URL}?amount={amount}&from=USD&to={to_currency}"
 		frappe.logger("request_booking").info(f"[Currency Convert API] REQUEST - URL: {url}")
-		resp = requests.get(
+		resp = _api_session.get(
 			url,
 			headers={"Content-Type": "application/json", "info": "true"},
 			timeout=30
@@ -817,6 +996,11 @@ def store_req_booking(
 			elif isinstance(hotel_details, list):
 				hotels_list = hotel_details
 
+		# Rooms are stored as pending whatever the payload says, so only the currency is checked
+		room_error = _validate_hotel_rooms(hotels_list, check_status=False)
+		if room_error:
+			return {"success": False, "error": room_error}
+
 		# Get or create employee if not exists
 		employee_name_result = None
 		employee_company = None
@@ -955,6 +1139,7 @@ def store_req_booking(
 
 		# Handle hotel and room details - create multiple Cart Hotel Items
 		created_hotel_items = []
+		rooms_by_item = []
 		if hotels_list:
 			for hotel_data in hotels_list:
 				# Create new cart hotel item for each hotel
@@ -974,39 +1159,19 @@ def store_req_booking(
 				cart_hotel_item.hotel_reviews = hotel_data.get("hotel_reviews", "")
 				cart_hotel_item.images = json.dumps(hotel_data.get("images", []))
 
-				# Add rooms
-				cart_hotel_item.rooms = []
+				# Rooms are bulk inserted for all hotels once the items have names
 				rooms_data = hotel_data.get("rooms", [])
-
-				for room in rooms_data:
-					cp = room.get("cancellation_policy", [])
-					cart_hotel_item.append("rooms", {
-						"room_id": room.get("room_id", ""),
-						"room_rate_id": room.get("room_rate_id", ""),
-						"room_name": room.get("room_name", ""),
-						"room_code": room.get("room_code", ""),
-						"price": room.get("price", 0),
-						"total_price": room.get("total_price", 0),
-						"tax": room.get("tax", 0),
-						"currency": room.get("currency", "USD"),
-						"status": "pending",
-						"images": json.dumps(room.get("images", [])),
-						"cancellation_policy": json.dumps(cp) if not isinstance(cp, str) else cp,
-						"breakfast_type": room.get("breakfast_type", "")
-					})
-
 				cart_hotel_item.room_count = len(rooms_data)
 				cart_hotel_item.save(ignore_permissions=True)
 				created_hotel_items.append(cart_hotel_item.name)
+				rooms_by_item.append((cart_hotel_item.name, rooms_data))
+
+			_bulk_insert_cart_hotel_rooms(rooms_by_item, status="pending")
 
-			# Link all cart hotel items to the Table MultiSelect field
+			# Link all cart hotel items to the Table MultiSelect field in bulk
 			if created_hotel_items:
-				booking_doc.cart_hotel_item = []  # Clear existing entries
-				for item_name in created_hotel_items:
-					booking_doc.append("cart_hotel_item", {
-						"cart_hotel_item": item_name
-					})
-				booking_doc.save(ignore_permissions=True)
+				_replace_cart_hotel_item_links(booking_doc.name, created_hotel_items)
+				booking_doc.reload()
 
 		# Fire-and-forget TripAdvisor URL API call for new hotels
 		if hotels_list:
@@ -1077,7 +1242,7 @@ def store_req_booking(
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "store_req_booking API Error")
+		frappe.log_error(title="store_req_booking API Error")
 		return {
 				"success": False,
 				"error": str(e),
@@ -1223,18 +1388,19 @@ def get_all_request_bookings(company=None, employee=None, status=None, page=None
 			):
 				booking_id_map[bk.name] = bk.booking_id or "NA"
 
-		# Batch-fetch cart hotel items and rooms
+		# Batch-fetch cart hotel items and rooms, unless res_payload leaves out
+		# every key that is built from them
 		request_names = [r.name for r in request_bookings]
 		cart_hotels_by_request = defaultdict(list)
 		rooms_by_hotel = defaultdict(list)
-
-		if request_names:
-			cart_hotels_raw = frappe.get_all(
-				"Cart Hotel Item",
-				filters={"request_booking": ["in", request_names]},
-				fields=["name", "request_booking", "hotel_id", "hotel_name",
-				         "supplier", "meal_plan", "cancellation_policy",
-				         "hotel_reviews", "images"]
+		needs_hotels = not response_keys or bool({"hotels", "amount"} & set(response_keys))
+
+		if request_names and needs_hotels:
+			cart_hotels_raw = _get_live_cart_hotels(
+				request_names,
+				["name", "request_booking", "hotel_id", "hotel_name",
+				 "supplier", "meal_plan", "cancellation_policy",
+				 "hotel_reviews", "images"]
 			)
 			for ch in cart_hotels_raw:
 				cart_hotels_by_request[ch.request_booking].append(ch)
@@ -1243,7 +1409,7 @@ def get_all_request_bookings(company=None, employee=None, status=None, page=None
 			if cart_hotel_names:
 				for rm in frappe.get_all(
 					"Cart Hotel Room",
-					filters={"parent": ["in", cart_hotel_names]},
+					filters={"parent": ["in", cart_hotel_names], "status": ["!=", "deleted"]},
 					fields=["parent", "room_id", "room_rate_id", "room_name",
 					         "room_code", "price", "total_price", "tax", "currency",
 					         "status", "images", "cancellation_policy", "breakfast_type"]
@@ -1264,27 +1430,14 @@ def get_all_request_bookings(company=None, employee=None, status=None, page=None
 			bk_id = booking_id_map.get(req.booking, "NA") if req.booking else "NA"
 
 			# Map request status to the expected room status for filtering
-			expected_room_status = {
-				"approval_received": "approved",
-				"req_payment_pending": "payment_pending",
-				"req_payment_success": "payment_success",
-			}.get(req.request_status)
+			expected_room_status = LIST_REQUEST_TO_ROOM_STATUS_MAP.get(req.request_status)
 
 			# Build hotel/room data from batch-fetched maps
 			hotels = []
 			total_amount = 0.0
 			for ch in cart_hotels_by_request.get(req.name, []):
-				all_rooms = rooms_by_hotel.get(ch.name, [])
-
-				# Skip hotel if every room is deleted or declined
-				if all_rooms and all(rm.status in ("deleted", "declined") for rm in all_rooms):
-					continue
-
 				rooms = []
-				for rm in all_rooms:
-					# Never surface deleted rooms
-					if rm.status == "deleted":
-						continue
+				for rm in rooms_by_hotel.get(ch.name, []):
 					if expected_room_status and (rm.status or "pending") != expected_room_status:
 						continue
 					room_data = {
@@ -1348,7 +1501,7 @@ def get_all_request_bookings(company=None, employee=None, status=None, page=None
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "get_all_request_bookings API Error")
+		frappe.log_error(title="get_all_request_bookings API Error")
 		return {
 				"success": False,
 				"error": str(e),
@@ -1404,43 +1557,35 @@ def get_request_booking_details(request_booking_id, status=None):
 		hotels = []
 		total_amount = 0.0
 
-		# Get hotels via the request_booking link
-		cart_hotel_items = frappe.get_all(
-			"Cart Hotel Item",
-			filters={"request_booking": req.name},
-			pluck="name"
+		# Get hotels via the request_booking link, then all their rooms in one query
+		cart_hotel_items = _get_live_cart_hotels(
+			[req.name],
+			["name", "hotel_id", "hotel_name", "supplier", "hotel_reviews", "images"]
 		)
+		rooms_by_hotel = defaultdict(list)
+		if cart_hotel_items:
+			for rm in frappe.get_all(
+				"Cart Hotel Room",
+				filters={"parent": ["in", [ch.name for ch in cart_hotel_items]], "status": ["!=", "deleted"]},
+				fields=["parent", "room_id", "room_rate_id", "room_name", "room_code",
+				         "price", "status", "images", "cancellation_policy", "breakfast_type"],
+				order_by="idx asc"
+			):
+				rooms_by_hotel[rm.parent].append(rm)
 
 		# Resolve destination currency once for all room-level conversions
 		dest_currency = _get_currency_for_country(req.destination_country or "")
 
-		# Define status filter mapping based on request status
-		room_status_filter = {
-			"offer_sent": "sent_for_approval",
-			"approval_received": "approved",
-			"req_payment_pending": "payment_pending",
-			"req_payment_success": "payment_success"
-		}
-
 		# Use status from query param if provided, otherwise use request's own status
 		if status:
 			required_room_status = status
 		else:
-			required_room_status = room_status_filter.get(req.request_status)
-
-		for cart_hotel_name in cart_hotel_items:
-			cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_name)
-
-			# Skip hotel if every room is deleted or declined
-			if cart_hotel.rooms and all(r.status in ("deleted", "declined") for r in cart_hotel.rooms):
-				continue
+			required_room_status = REQUEST_TO_ROOM_STATUS_MAP.get(req.request_status)
 
+		for cart_hotel in cart_hotel_items:
 			# Get rooms for this hotel
 			rooms = []
-			for room in cart_hotel.rooms:
-				# Never surface deleted rooms
-				if room.status == "deleted":
-					continue
+			for room in rooms_by_hotel.get(cart_hotel.name, []):
 				# Filter rooms based on request status
 				if required_room_status and (room.status or "pending") != required_room_status:
 					continue
@@ -1512,7 +1657,7 @@ def get_request_booking_details(request_booking_id, status=None):
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "get_request_booking_details API Error")
+		frappe.log_error(title="get_request_booking_details API Error")
 		return {
 			"success": False,
 			"error": str(e)
@@ -1537,7 +1682,7 @@ def send_email_via_api(to_emails, subject, body):
 	frappe.logger("request_booking").info(
 		f"[Email Send API] REQUEST - URL: {url}, To: {to_emails}, Subject: {subject}"
 	)
-	response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=30)
+	response = _api_session.post(url, headers=headers, data=json.dumps(payload), timeout=30)
 	frappe.logger("request_booking").info(
 		f"[Email Send API] RESPONSE - Status: {response.status_code}, Body: {response.text}"
 	)
@@ -1548,6 +1693,42 @@ def send_email_via_api(to_emails, subject, body):
 	return response.json()
 
 
+def _send_approval_email(to_emails, subject, body_args):
+	"""
+	Background job: fetch the review token, render the approval email and send it
+	through the external email API. body_args are the generate_approval_email_body kwargs.
+	"""
+	try:
+		send_email_via_api(to_emails, subject, generate_approval_email_body(**body_args))
+	except Exception as e:
+		frappe.log_error(
+			f"Failed to send approval email: {str(e)}",
+			"sent_for_approval Email Error"
+		)
+
+
+def _fire_approval_email(to_emails, subject, body_args):
+	"""
+	Queue the approval email. Called after send_for_approval has committed the
+	status updates, so the job is queued right away rather than on a later commit.
+	Uses frappe.enqueue like the other outbound API calls in this module; the
+	token request and template rendering happen in the worker too.
+	"""
+	frappe.enqueue(
+		_send_approval_email,
+		queue="short",
+		timeout=60,
+		to_emails=to_emails,
+		subject=subject,
+		body_args=body_args
+	)
+
+
+# Rendered through Frappe's Jinja environment, which compiles and caches it once;
+# the template escapes every value since that environment does not autoescape
+APPROVAL_EMAIL_TEMPLATE = "destiin/templates/emails/approval_request.html"
+
+
 def generate_approval_email_body(employee_name, check_in, check_out, destination="", request_booking_id="", number_of_guests=0, number_of_hotel_options=0, agent_email=""):
 	"""
 	Generate HTML email body for sent_for_approval notification.
@@ -1560,7 +1741,7 @@ def generate_approval_email_body(employee_name, check_in, check_out, destination
 		frappe.logger("request_booking").info(
 			f"[Email Auth Token API] REQUEST - URL: {EMAIL_AUTHENTICATION_API_URL}, Payload: {json.dumps(token_payload)}"
 		)
-		token_response = requests.post(
+		token_response = _api_session.post(
 			EMAIL_AUTHENTICATION_API_URL,
 			headers={"Content-Type": "application/json"},
 			json=token_payload,
@@ -1579,330 +1760,16 @@ def generate_approval_email_body(employee_name, check_in, check_out, destination
 	# Review link with token
 	review_link = f"https://cbt-dev-destiin.vercel.app/hotels/{request_booking_id}/review?token={token}"
 
-	html_body = f"""<!DOCTYPE html>
-<html lang="en" xmlns="http://www.w3.org/1999/xhtml" xmlns:v="urn:schemas-microsoft-com:vml"
-    xmlns:o="urn:schemas-microsoft-com:office:office">
-
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <meta http-equiv="X-UA-Compatible" content="IE=edge">
-    <meta name="x-apple-disable-message-reformatting">
-    <title>Hotel Approval Request - Destiin</title>
-    <!--[if mso]>
-    <noscript>
-        <xml>
-            <o:OfficeDocumentSettings>
-                <o:PixelsPerInch>96</o:PixelsPerInch>
-            </o:OfficeDocumentSettings>
-        </xml>
-    </noscript>
-    <![endif]-->
-    <style>
-        /* Reset styles */
-        body,
-        table,
-        td,
-        a {{{{
-            -webkit-text-size-adjust: 100%;
-            -ms-text-size-adjust: 100%;
-        }}}}
-
-        table,
-        td {{{{
-            mso-table-lspace: 0pt;
-            mso-table-rspace: 0pt;
-        }}}}
-
-        img {{{{
-            -ms-interpolation-mode: bicubic;
-            border: 0;
-            height: auto;
-            line-height: 100%;
-            outline: none;
-            text-decoration: none;
-        }}}}
-
-        /* Base styles */
-        body {{{{
-            margin: 0 !important;
-            padding: 0 !important;
-            width: 100% !important;
-            height: 100% !important;
-            font-family: 'Outfit', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif !important;
-            /* background-color: #050a14 !important; */
-            background-color: transparent !important;
-            color: #ededed !important;
-        }}}}
-
-        /* Prevent auto-scaling in iOS */
-        * {{{{
-            -webkit-text-size-adjust: none;
-        }}}}
-
-        /* Link styles */
-        a {{{{
-            color: #7ecda5;
-            text-decoration: none;
-        }}}}
-
-        a:hover {{{{
-            text-decoration: underline;
-        }}}}
-
-        /* Responsive */
-        @media only screen and (max-width: 700px) {{{{
-            .email-container {{{{
-                width: 100% !important;
-            }}}}
-
-            .mobile-padding {{{{
-                padding: 20px !important;
-            }}}}
-
-            .mobile-text-center {{{{
-                text-align: center !important;
-            }}}}
-
-            .cta-button {{{{
-                padding: 14px 36px !important;
-                font-size: 15px !important;
-            }}}}
-        }}}}
-    </style>
-</head>
-
-<body
-    style="margin: 0; padding: 0; font-family: 'Outfit', -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;">
-
-    <!-- Wrapper Table -->
-    <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">
-        <tr>
-            <td align="center" style="padding: 20px 0;">
-
-                <!-- Main Container -->
-                <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="700"
-                    class="email-container"
-                    style="max-width: 700px; background-color: #0e0f1d; border-radius: 16px; overflow: hidden;">
-
-                    <!-- Header -->
-                    <tr>
-                        <td
-                            style="background: linear-gradient(135deg, #0e0f1d 0%, #1a1d35 100%); padding: 40px 30px; text-align: center; border-bottom: 2px solid rgba(126, 205, 165, 0.2);">
-                            <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">
-                                <tr>
-                                    <td align="center">
-                                        <h1
-                                            style="margin: 0 0 8px 0; font-size: 32px; font-weight: 700; color: #7ecda5; letter-spacing: -0.5px;">
-                                            DESTIIN</h1>
-                                        <p style="margin: 0; font-size: 14px; color: #a0a0a0; font-weight: 400;">Your
-                                            Travel, Simplified</p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-
-                    <!-- Content -->
-                    <tr>
-                        <td style="padding: 40px 40px;" class="mobile-padding">
-                            <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">
-
-                                <!-- Greeting -->
-                                <tr>
-                                    <td style="padding-bottom: 16px;">
-                                        <p style="margin: 0; font-size: 18px; font-weight: 600; color: #ededed;">Hello
-                                            {employee_name},</p>
-                                    </td>
-                                </tr>
-
-                                <!-- Message -->
-                                <tr>
-                                    <td style="padding-bottom: 24px;">
-                                        <p style="margin: 0; font-size: 15px; color: #a0a0a0; line-height: 1.7;">
-                                            We have carefully reviewed your travel requirements and are pleased to
-                                            present our recommended hotel options for your upcoming trip.
-                                        </p>
-                                    </td>
-                                </tr>
-
-                                <!-- Hotel Summary Card -->
-                                <tr>
-                                    <td style="padding: 24px 0;">
-                                        <table role="presentation" cellspacing="0" cellpadding="0" border="0"
-                                            width="100%"
-                                            style="background-color: rgba(30, 41, 59, 0.5); border: 1px solid rgba(255, 255, 255, 0.1); border-radius: 12px;">
-                                            <tr>
-                                                <td style="padding: 24px;">
-                                                    <table role="presentation" cellspacing="0" cellpadding="0"
-                                                        border="0" width="100%">
-                                                        <!-- Card Title -->
-                                                        <tr>
-                                                            <td colspan="2" style="padding-bottom: 16px;">
-                                                                <p
-                                                                    style="margin: 0; font-size: 14px; font-weight: 600; color: #7ecda5; text-transform: uppercase; letter-spacing: 1px;">
-                                                                    📍 TRIP SUMMARY</p>
-                                                            </td>
-                                                        </tr>
-
-                                                        <!-- Destination -->
-                                                        <tr>
-                                                            <td
-                                                                style="padding: 8px 16px 8px 0; font-size: 13px; color: #a0a0a0; font-weight: 500; width: 40%;">
-                                                                Destination:</td>
-                                                            <td
-                                                                style="padding: 8px 0; font-size: 14px; color: #ededed; font-weight: 500;">
-                                                                {destination}</td>
-                                                        </tr>
-
-                                                        <!-- Check-in -->
-                                                        <tr>
-                                                            <td
-                                                                style="padding: 8px 16px 8px 0; font-size: 13px; color: #a0a0a0; font-weight: 500;">
-                                                                Check-in:</td>
-                                                            <td
-                                                                style="padding: 8px 0; font-size: 14px; color: #ededed; font-weight: 500;">
-                                                                {check_in}</td>
-                                                        </tr>
-
-                                                        <!-- Check-out -->
-                                                        <tr>
-                                                            <td
-                                                                style="padding: 8px 16px 8px 0; font-size: 13px; color: #a0a0a0; font-weight: 500;">
-                                                                Check-out:</td>
-                                                            <td
-                                                                style="padding: 8px 0; font-size: 14px; color: #ededed; font-weight: 500;">
-                                                                {check_out}</td>
-                                                        </tr>
-
-                                                        <!-- Guests -->
-                                                        <tr>
-                                                            <td
-                                                                style="padding: 8px 16px 8px 0; font-size: 13px; color: #a0a0a0; font-weight: 500;">
-                                                                Guests:</td>
-                                                            <td
-                                                                style="padding: 8px 0; font-size: 14px; color: #ededed; font-weight: 500;">
-                                                                {number_of_guests}</td>
-                                                        </tr>
-
-                                                        <!-- Hotels Suggested -->
-                                                        <tr>
-                                                            <td
-                                                                style="padding: 8px 16px 8px 0; font-size: 13px; color: #a0a0a0; font-weight: 500;">
-                                                                Hotels Suggested:</td>
-                                                            <td
-                                                                style="padding: 8px 0; font-size: 14px; color: #ededed; font-weight: 500;">
-                                                                {number_of_hotel_options} Options</td>
-                                                        </tr>
-                                                    </table>
-                                                </td>
-                                            </tr>
-                                        </table>
-                                    </td>
-                                </tr>
-
-                                <!-- Message 2 -->
-                                <tr>
-                                    <td style="padding-bottom: 24px;">
-                                        <p style="margin: 0; font-size: 15px; color: #a0a0a0; line-height: 1.7;">
-                                            Our travel team has handpicked hotels that match your preferences, budget,
-                                            and company policies. Click the button below to review all available options
-                                            and make your selection.
-                                        </p>
-                                    </td>
-                                </tr>
-
-                                <!-- CTA Button -->
-                                <tr>
-                                    <td align="center" style="padding: 32px 0;">
-                                        <table role="presentation" cellspacing="0" cellpadding="0" border="0">
-                                            <tr>
-                                                <td align="center"
-                                                    style="border-radius: 12px; background-color: #7ecda5;">
-                                                    <a href="{review_link}" target="_blank" class="cta-button"
-                                                        style="display: inline-block; padding: 16px 48px; font-size: 16px; font-weight: 600; color: #0e0f1d; text-decoration: none; border-radius: 12px; font-family: 'Outfit', Arial, sans-serif;">
-                                                        View Hotel Options
-                                                    </a>
-                                                </td>
-                                            </tr>
-                                        </table>
-                                    </td>
-                                </tr>
-
-                                <!-- Divider -->
-                                <tr>
-                                    <td style="padding: 32px 0;">
-                                        <table role="presentation" cellspacing="0" cellpadding="0" border="0"
-                                            width="100%">
-                                            <tr>
-                                                <td style="border-top: 1px solid rgba(255, 255, 255, 0.1);"></td>
-                                            </tr>
-                                        </table>
-                                    </td>
-                                </tr>
-
-                                <!-- Help Text -->
-                                <tr>
-                                    <td align="center" style="padding: 24px 0;">
-                                        <p
-                                            style="margin: 0 0 8px 0; font-size: 14px; color: #a0a0a0; line-height: 1.6;">
-                                            Have questions or need different options?
-                                        </p>
-                                        <p style="margin: 0; font-size: 14px; color: #a0a0a0; line-height: 1.6;">
-                                            Reply to this email or contact your travel agent at <a
-                                                href="mailto:{agent_email}"
-                                                style="color: #7ecda5; text-decoration: none; font-weight: 500;">{agent_email}</a>
-                                        </p>
-                                    </td>
-                                </tr>
-
-                            </table>
-                        </td>
-                    </tr>
-
-                    <!-- Footer -->
-                    <tr>
-                        <td
-                            style="background-color: #050a14; padding: 30px; text-align: center; border-top: 1px solid rgba(255, 255, 255, 0.05);">
-                            <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">
-                                <tr>
-                                    <td align="center">
-                                        <p style="margin: 0 0 8px 0; font-size: 12px; color: #a0a0a0;">
-                                            © 2026 Destiin. All rights reserved.
-                                        </p>
-                                        <p style="margin: 0 0 16px 0; font-size: 12px; color: #a0a0a0;">
-                                            This is an automated notification regarding your travel booking request.
-                                        </p>
-                                        <p style="margin: 0; font-size: 12px;">
-                                            <a href="[PRIVACY_POLICY_URL]"
-                                                style="color: #7ecda5; text-decoration: none; font-weight: 500; margin: 0 12px;">Privacy
-                                                Policy</a>
-                                            <a href="[TERMS_URL]"
-                                                style="color: #7ecda5; text-decoration: none; font-weight: 500; margin: 0 12px;">Terms
-                                                of Service</a>
-                                            <a href="[SUPPORT_URL]"
-                                                style="color: #7ecda5; text-decoration: none; font-weight: 500; margin: 0 12px;">Support</a>
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                        </td>
-                    </tr>
-
-                </table>
-                <!-- End Main Container -->
-
-            </td>
-        </tr>
-    </table>
-    <!-- End Wrapper Table -->
-
-</body>
-
-</html>
-"""
-
-	return html_body
+	return frappe.render_template(APPROVAL_EMAIL_TEMPLATE, dict(
+		employee_name=employee_name,
+		destination=destination,
+		check_in=check_in,
+		check_out=check_out,
+		number_of_guests=number_of_guests,
+		number_of_hotel_options=number_of_hotel_options,
+		review_link=review_link,
+		agent_email=agent_email,
+	))
 
 
 @frappe.whitelist(allow_guest=False)
@@ -1944,6 +1811,27 @@ def send_for_approval(request_booking_id, selected_items):
 					"error": "selected_items is required and cannot be empty"
 			}
 
+		if len(selected_items) > MAX_SELECTED_ITEMS:
+			return {
+					"success": False,
+					"error": f"selected_items cannot contain more than {MAX_SELECTED_ITEMS} hotels"
+			}
+
+		# Build a mapping of selected hotel_ids to a set of room_rate_ids for O(1) membership checks
+		selected_hotel_map = {}
+		for item in selected_items:
+			hotel_id = item.get("hotel_id")
+			room_rate_ids = item.get("room_rate_ids", [])
+			if hotel_id:
+				selected_hotel_map[hotel_id] = set([room_rate_ids] if isinstance(room_rate_ids, str) else room_rate_ids)
+
+		# Nothing to send (no item carried a hotel_id) — stop before any DB work
+		if not selected_hotel_map:
+			return {
+					"success": False,
+					"error": "selected_items must include at least one hotel_id"
+			}
+
 		# Check if booking exists
 		booking_doc = frappe.db.get_value(
 			"Request Booking Details",
@@ -1962,7 +1850,9 @@ def send_for_approval(request_booking_id, selected_items):
 		employee_name = ""
 		employee_email = booking_doc.employee_email or ""
 		if booking_doc.employee:
-			employee_doc = frappe.get_value(
+			# Document cache: repeat approvals for the same employee skip the query,
+			# and Frappe clears the entry whenever the Employee is saved
+			employee_doc = frappe.get_cached_value(
 				"Employee",
 				booking_doc.employee,
 				["employee_name", "company_email", "personal_email"],
@@ -1976,7 +1866,7 @@ def send_for_approval(request_booking_id, selected_items):
 		# Get agent email
 		agent_email = ""
 		if booking_doc.agent:
-			agent_doc = frappe.get_value(
+			agent_doc = frappe.get_cached_value(
 				"User",
 				booking_doc.agent,
 				["email"],
@@ -1985,96 +1875,92 @@ def send_for_approval(request_booking_id, selected_items):
 			if agent_doc:
 				agent_email = agent_doc.get("email", "")
 
-		# Build a mapping of selected hotel_ids to room_rate_ids
-		selected_hotel_map = {}
-		for item in selected_items:
-			hotel_id = item.get("hotel_id")
-			room_rate_ids = item.get("room_rate_ids", [])
-			if hotel_id:
-				selected_hotel_map[hotel_id] = room_rate_ids
-
 		# Track updated hotels data for email
 		updated_hotels_data = []
 		updated_count = 0
 
-		# Get all cart hotel items linked to this booking
-		cart_hotel_items = frappe.get_all(
+		# Only the selected hotels of this booking, and their rooms in one query
+		cart_hotels = frappe.get_all(
 			"Cart Hotel Item",
-			filters={"request_booking": booking_doc.name},
-			pluck="name"
+			filters={"request_booking": booking_doc.name, "hotel_id": ["in", list(selected_hotel_map)]},
+			fields=CART_HOTEL_SUMMARY_FIELDS
 		)
+		rooms_by_hotel = defaultdict(list)
+		if cart_hotels:
+			for rm in frappe.get_all(
+				"Cart Hotel Room",
+				filters={"parent": ["in", [ch.name for ch in cart_hotels]]},
+				fields=CART_ROOM_ACTION_FIELDS + ["total_price", "tax", "currency"],
+				order_by="idx asc"
+			):
+				rooms_by_hotel[rm.parent].append(rm)
+
+		sent_room_names = []
+		for cart_hotel in cart_hotels:
+			selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+
+			# Collect the selected rooms; their status is updated in bulk below
+			matched_rooms = []
+			for room in rooms_by_hotel.get(cart_hotel.name, []):
+				if room.room_rate_id in selected_room_rate_ids:
+					sent_room_names.append(room.name)
+					matched_rooms.append({
+						"room_id": room.room_id,
+						"room_rate_id": room.room_rate_id,
+						"room_name": room.room_name,
+						"price": float(room.price or 0),
+						"total_price": float(room.total_price or 0),
+						"tax": float(room.tax or 0),
+						"currency": room.currency or "USD"
+					})
 
-		for cart_hotel_name in cart_hotel_items:
-			cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_name)
-
-			# Check if this hotel is in selected items
-			if cart_hotel.hotel_id in selected_hotel_map:
-				selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
-
-				hotel_data = {
+			# Only build the hotel entry once a room has matched
+			if matched_rooms:
+				updated_hotels_data.append({
 					"hotel_id": cart_hotel.hotel_id,
 					"hotel_name": cart_hotel.hotel_name,
 					"supplier": cart_hotel.supplier,
 					# "meal_plan": cart_hotel.meal_plan,
 					# "cancellation_policy": cart_hotel.cancellation_policy,
-					"rooms": []
-				}
-
-				# Update status for selected rooms
-				for room in cart_hotel.rooms:
-					if room.room_rate_id in selected_room_rate_ids:
-						room.status = "sent_for_approval"
-						updated_count += 1
+					"rooms": matched_rooms
+				})
 
-						hotel_data["rooms"].append({
-							"room_id": room.room_id,
-							"room_rate_id": room.room_rate_id,
-							"room_name": room.room_name,
-							"price": float(room.price or 0),
-							"total_price": float(room.total_price or 0),
-							"tax": float(room.tax or 0),
-							"currency": room.currency or "USD"
-						})
-
-				# Save the cart hotel item
-				cart_hotel.save(ignore_permissions=True)
-
-				if hotel_data["rooms"]:
-					updated_hotels_data.append(hotel_data)
+		updated_count = len(sent_room_names)
+		if sent_room_names:
+			frappe.db.set_value("Cart Hotel Room", {"name": ["in", sent_room_names]}, "status", "sent_for_approval")
 
 		# Update the request booking status based on room statuses
 		new_request_status = update_request_status_from_rooms(booking_doc.name)
 
 		frappe.db.commit()
 
-		# Prepare email recipients
-		to_emails = []
-		if employee_email:
-			to_emails.append(employee_email)
-		if agent_email and agent_email != employee_email:
-			to_emails.append(agent_email)
+		# Prepare email recipients (hash-deduped, first occurrence order kept)
+		to_emails = list(dict.fromkeys(e for e in (employee_email, agent_email) if e))
 
-		# Send email notification
-		email_sent = False
+		# Queue the email notification
+		email_queued = False
 		if to_emails and updated_hotels_data:
 			try:
-				fallback_subject = f"Booking Approval Request - {employee_name} ({str(booking_doc.check_in)} to {str(booking_doc.check_out)})"
-				subject = booking_doc.email_subject or fallback_subject
-				body = generate_approval_email_body(
-					employee_name=employee_name,
-					check_in=str(booking_doc.check_in) if booking_doc.check_in else "",
-					check_out=str(booking_doc.check_out) if booking_doc.check_out else "",
-					destination=booking_doc.destination or "",
-					request_booking_id=request_booking_id,
-					number_of_guests=booking_doc.adult_count or 0,
-					number_of_hotel_options=len(updated_hotels_data),
-					agent_email=agent_email or ""
+				subject = booking_doc.email_subject or (
+					f"Booking Approval Request - {employee_name} ({str(booking_doc.check_in)} to {str(booking_doc.check_out)})"
 				)
-				send_email_via_api(to_emails, subject, body)
-				email_sent = True
+				body_args = {
+					"employee_name": employee_name,
+					"check_in": str(booking_doc.check_in) if booking_doc.check_in else "",
+					"check_out": str(booking_doc.check_out) if booking_doc.check_out else "",
+					"destination": booking_doc.destination or "",
+					"request_booking_id": request_booking_id,
+					"number_of_guests": booking_doc.adult_count or 0,
+					"number_of_hotel_options": len(updated_hotels_data),
+					"agent_email": agent_email or ""
+				}
+				# Rendered and sent by a worker so the request waits on neither the
+				# token API nor the email API
+				_fire_approval_email(to_emails, subject, body_args)
+				email_queued = True
 			except Exception as email_error:
 				frappe.log_error(
-					f"Failed to send approval email: {str(email_error)}",
+					f"Failed to queue approval email: {str(email_error)}",
 					"sent_for_approval Email Error"
 				)
 
@@ -2084,14 +1970,14 @@ def send_for_approval(request_booking_id, selected_items):
 				"data": {
 					"request_booking_id": request_booking_id,
 					"updated_count": updated_count,
-					"email_sent": email_sent,
+					"email_queued": email_queued,
 					"email_recipients": to_emails,
 					"updated_hotels": updated_hotels_data
 				}
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "sent_for_approval API Error")
+		frappe.log_error(title="sent_for_approval API Error")
 		return {
 				"success": False,
 				"error": str(e)
@@ -2147,27 +2033,25 @@ def approve_booking(request_booking_id, employee, selected_items):
 					"error": "selected_items is required and cannot be empty"
 			}
 
-		# Check if booking exists and belongs to the employee
-		booking_doc = frappe.db.get_value(
+		# Check if booking exists and belongs to the employee (only the name is needed)
+		booking_name = frappe.db.exists(
 			"Request Booking Details",
-			{"request_booking_id": request_booking_id, "employee": employee},
-			["name", "employee", "agent", "check_in", "check_out", "request_status"],
-			as_dict=True
+			{"request_booking_id": request_booking_id, "employee": employee}
 		)
 
-		if not booking_doc:
+		if not booking_name:
 			return {
 					"success": False,
 					"error": f"Request booking not found for ID: {request_booking_id} and employee: {employee}"
 			}
 
-		# Build a mapping of selected hotel_ids to room_rate_ids
+		# Build a mapping of selected hotel_ids to a set of room_rate_ids for O(1) membership checks
 		selected_hotel_map = {}
 		for item in selected_items:
 			hotel_id = item.get("hotel_id")
 			room_rate_ids = item.get("room_rate_ids", [])
 			if hotel_id:
-				selected_hotel_map[hotel_id] = room_rate_ids
+				selected_hotel_map[hotel_id] = set([room_rate_ids] if isinstance(room_rate_ids, str) else room_rate_ids)
 
 		# Track updated hotels data
 		updated_hotels_data = []
@@ -2175,70 +2059,72 @@ def approve_booking(request_booking_id, employee, selected_items):
 		updated_count = 0
 		declined_count = 0
 
-		# Get all cart hotel items linked to this booking
-		cart_hotel_items = frappe.get_all(
+		# Only the selected hotels of this booking, and their rooms in one query
+		cart_hotels = frappe.get_all(
 			"Cart Hotel Item",
-			filters={"request_booking": booking_doc.name},
-			pluck="name"
-		)
-
-		for cart_hotel_name in cart_hotel_items:
-			cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_name)
-
-			# Check if this hotel is in selected items
-			if cart_hotel.hotel_id in selected_hotel_map:
-				selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+			filters={"request_booking": booking_name, "hotel_id": ["in", list(selected_hotel_map)]},
+			fields=CART_HOTEL_SUMMARY_FIELDS
+		) if selected_hotel_map else []
+		rooms_by_hotel = defaultdict(list)
+		if cart_hotels:
+			for rm in frappe.get_all(
+				"Cart Hotel Room",
+				filters={"parent": ["in", [ch.name for ch in cart_hotels]]},
+				fields=CART_ROOM_ACTION_FIELDS,
+				order_by="idx asc"
+			):
+				rooms_by_hotel[rm.parent].append(rm)
+
+		approved_room_names = []
+		declined_room_names = []
+		for cart_hotel in cart_hotels:
+			selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+
+			# Approve the selected rooms and decline all others; statuses are updated in bulk below
+			approved_rooms = []
+			declined_rooms = []
+			for room in rooms_by_hotel.get(cart_hotel.name, []):
+				room_rate_id = room.room_rate_id
+				is_approved = room_rate_id in selected_room_rate_ids
+				room_data = {
+					"room_id": room.room_id,
+					"room_rate_id": room_rate_id,
+					"room_name": room.room_name,
+					"price": float(room.price or 0),
+					"status": "approved" if is_approved else "declined"
+				}
+				if is_approved:
+					approved_room_names.append(room.name)
+					approved_rooms.append(room_data)
+				else:
+					declined_room_names.append(room.name)
+					declined_rooms.append(room_data)
 
-				hotel_data = {
+			# Only build the hotel entries once a room has matched
+			if approved_rooms:
+				updated_hotels_data.append({
 					"hotel_id": cart_hotel.hotel_id,
 					"hotel_name": cart_hotel.hotel_name,
 					"supplier": cart_hotel.supplier,
-					"rooms": []
-				}
-
-				declined_hotel_data = {
+					"rooms": approved_rooms
+				})
+			if declined_rooms:
+				declined_hotels_data.append({
 					"hotel_id": cart_hotel.hotel_id,
 					"hotel_name": cart_hotel.hotel_name,
 					"supplier": cart_hotel.supplier,
-					"rooms": []
-				}
+					"rooms": declined_rooms
+				})
 
-				# Update status for selected rooms to approved, decline all others
-				for room in cart_hotel.rooms:
-					if room.room_rate_id in selected_room_rate_ids:
-						room.status = "approved"
-						updated_count += 1
-
-						hotel_data["rooms"].append({
-							"room_id": room.room_id,
-							"room_rate_id": room.room_rate_id,
-							"room_name": room.room_name,
-							"price": float(room.price or 0),
-							"status": "approved"
-						})
-					else:
-						# Automatically decline non-selected rooms
-						room.status = "declined"
-						declined_count += 1
-
-						declined_hotel_data["rooms"].append({
-							"room_id": room.room_id,
-							"room_rate_id": room.room_rate_id,
-							"room_name": room.room_name,
-							"price": float(room.price or 0),
-							"status": "declined"
-						})
-
-				# Save the cart hotel item
-				cart_hotel.save(ignore_permissions=True)
-
-				if hotel_data["rooms"]:
-					updated_hotels_data.append(hotel_data)
-				if declined_hotel_data["rooms"]:
-					declined_hotels_data.append(declined_hotel_data)
+		updated_count = len(approved_room_names)
+		declined_count = len(declined_room_names)
+		if approved_room_names:
+			frappe.db.set_value("Cart Hotel Room", {"name": ["in", approved_room_names]}, "status", "approved")
+		if declined_room_names:
+			frappe.db.set_value("Cart Hotel Room", {"name": ["in", declined_room_names]}, "status", "declined")
 
 		# Update the request booking status based on room statuses
-		new_request_status = update_request_status_from_rooms(booking_doc.name)
+		new_request_status = update_request_status_from_rooms(booking_name)
 
 		frappe.db.commit()
 
@@ -2257,7 +2143,7 @@ def approve_booking(request_booking_id, employee, selected_items):
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "approve_booking API Error")
+		frappe.log_error(title="approve_booking API Error")
 		return {
 				"success": False,
 				"error": str(e)
@@ -2309,75 +2195,82 @@ def decline_booking(request_booking_id, employee, selected_items):
 					"error": "selected_items is required and cannot be empty"
 			}
 
-		# Check if booking exists and belongs to the employee
-		booking_doc = frappe.db.get_value(
+		# Check if booking exists and belongs to the employee (only the name is needed)
+		booking_name = frappe.db.exists(
 			"Request Booking Details",
-			{"request_booking_id": request_booking_id, "employee": employee},
-			["name", "employee", "agent", "check_in", "check_out", "request_status"],
-			as_dict=True
+			{"request_booking_id": request_booking_id, "employee": employee}
 		)
 
-		if not booking_doc:
+		if not booking_name:
 			return {
 					"success": False,
 					"error": f"Request booking not found for ID: {request_booking_id} and employee: {employee}"
 			}
 
-		# Build a mapping of selected hotel_ids to room_rate_ids
+		# Build a mapping of selected hotel_ids to a set of room_rate_ids for O(1) membership checks
 		selected_hotel_map = {}
 		for item in selected_items:
 			hotel_id = item.get("hotel_id")
 			room_rate_ids = item.get("room_rate_ids", [])
 			if hotel_id:
-				selected_hotel_map[hotel_id] = room_rate_ids
+				selected_hotel_map[hotel_id] = set([room_rate_ids] if isinstance(room_rate_ids, str) else room_rate_ids)
 
 		# Track declined hotels data
 		declined_hotels_data = []
 		declined_count = 0
 
-		# Get all cart hotel items linked to this booking
-		cart_hotel_items = frappe.get_all(
+		# Only the selected hotels of this booking, and only their selected rooms, in one query each
+		cart_hotels = frappe.get_all(
 			"Cart Hotel Item",
-			filters={"request_booking": booking_doc.name},
-			pluck="name"
-		)
-
-		for cart_hotel_name in cart_hotel_items:
-			cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_name)
-
-			# Check if this hotel is in selected items
-			if cart_hotel.hotel_id in selected_hotel_map:
-				selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+			filters={"request_booking": booking_name, "hotel_id": ["in", list(selected_hotel_map)]},
+			fields=CART_HOTEL_SUMMARY_FIELDS
+		) if selected_hotel_map else []
+		selected_rate_ids = {rid for rids in selected_hotel_map.values() for rid in rids}
+		rooms_by_hotel = defaultdict(list)
+		if cart_hotels and selected_rate_ids:
+			for rm in frappe.get_all(
+				"Cart Hotel Room",
+				filters={
+					"parent": ["in", [ch.name for ch in cart_hotels]],
+					"room_rate_id": ["in", list(selected_rate_ids)]
+				},
+				fields=CART_ROOM_ACTION_FIELDS,
+				order_by="idx asc"
+			):
+				rooms_by_hotel[rm.parent].append(rm)
+
+		declined_room_names = []
+		for cart_hotel in cart_hotels:
+			selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+
+			# Collect the selected rooms; their status is updated in bulk below
+			matched_rooms = []
+			for room in rooms_by_hotel.get(cart_hotel.name, []):
+				if room.room_rate_id in selected_room_rate_ids:
+					declined_room_names.append(room.name)
+					matched_rooms.append({
+						"room_id": room.room_id,
+						"room_rate_id": room.room_rate_id,
+						"room_name": room.room_name,
+						"price": float(room.price or 0),
+						"status": "declined"
+					})
 
-				hotel_data = {
+			# Only build the hotel entry once a room has matched
+			if matched_rooms:
+				declined_hotels_data.append({
 					"hotel_id": cart_hotel.hotel_id,
 					"hotel_name": cart_hotel.hotel_name,
 					"supplier": cart_hotel.supplier,
-					"rooms": []
-				}
+					"rooms": matched_rooms
+				})
 
-				# Update status for selected rooms to declined
-				for room in cart_hotel.rooms:
-					if room.room_rate_id in selected_room_rate_ids:
-						room.status = "declined"
-						declined_count += 1
-
-						hotel_data["rooms"].append({
-							"room_id": room.room_id,
-							"room_rate_id": room.room_rate_id,
-							"room_name": room.room_name,
-							"price": float(room.price or 0),
-							"status": "declined"
-						})
-
-				# Save the cart hotel item
-				cart_hotel.save(ignore_permissions=True)
-
-				if hotel_data["rooms"]:
-					declined_hotels_data.append(hotel_data)
+		declined_count = len(declined_room_names)
+		if declined_room_names:
+			frappe.db.set_value("Cart Hotel Room", {"name": ["in", declined_room_names]}, "status", "declined")
 
 		# Update the request booking status based on room statuses
-		new_request_status = update_request_status_from_rooms(booking_doc.name)
+		new_request_status = update_request_status_from_rooms(booking_name)
 
 		frappe.db.commit()
 
@@ -2394,7 +2287,7 @@ def decline_booking(request_booking_id, employee, selected_items):
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "decline_booking API Error")
+		frappe.log_error(title="decline_booking API Error")
 		return {
 				"success": False,
 				"error": str(e)
@@ -2447,75 +2340,78 @@ def delete_room(request_booking_id, employee, selected_items):
 					"error": "selected_items is required and cannot be empty"
 			}
 
-		# Check if booking exists and belongs to the employee
-		booking_doc = frappe.db.get_value(
+		# Check if booking exists and belongs to the employee (only the name is needed)
+		booking_name = frappe.db.exists(
 			"Request Booking Details",
-			{"request_booking_id": request_booking_id, "employee": employee},
-			["name", "employee", "agent", "check_in", "check_out", "request_status"],
-			as_dict=True
+			{"request_booking_id": request_booking_id, "employee": employee}
 		)
 
-		if not booking_doc:
+		if not booking_name:
 			return {
 					"success": False,
 					"error": f"Request booking not found for ID: {request_booking_id} and employee: {employee}"
 			}
 
-		# Build a mapping of selected hotel_ids to room_rate_ids
+		# Build a mapping of selected hotel_ids to a set of room_rate_ids for O(1) membership checks
 		selected_hotel_map = {}
 		for item in selected_items:
 			hotel_id = item.get("hotel_id")
 			room_rate_ids = item.get("room_rate_ids", [])
 			if hotel_id:
-				selected_hotel_map[hotel_id] = room_rate_ids
+				selected_hotel_map[hotel_id] = set([room_rate_ids] if isinstance(room_rate_ids, str) else room_rate_ids)
 
 		# Track deleted rooms data
 		deleted_hotels_data = []
 		deleted_count = 0
 
-		# Get all cart hotel items linked to this booking
-		cart_hotel_items = frappe.get_all(
+		# Only the selected hotels of this booking, and their rooms in one query
+		cart_hotels = frappe.get_all(
 			"Cart Hotel Item",
-			filters={"request_booking": booking_doc.name},
-			pluck="name"
-		)
-
-		for cart_hotel_name in cart_hotel_items:
-			cart_hotel = frappe.get_doc("Cart Hotel Item", cart_hotel_name)
-
-			# Check if this hotel is in selected items
-			if cart_hotel.hotel_id in selected_hotel_map:
-				selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+			filters={"request_booking": booking_name, "hotel_id": ["in", list(selected_hotel_map)]},
+			fields=CART_HOTEL_SUMMARY_FIELDS
+		) if selected_hotel_map else []
+		rooms_by_hotel = defaultdict(list)
+		if cart_hotels:
+			for rm in frappe.get_all(
+				"Cart Hotel Room",
+				filters={"parent": ["in", [ch.name for ch in cart_hotels]]},
+				fields=CART_ROOM_ACTION_FIELDS,
+				order_by="idx asc"
+			):
+				rooms_by_hotel[rm.parent].append(rm)
+
+		deleted_room_names = []
+		for cart_hotel in cart_hotels:
+			selected_room_rate_ids = selected_hotel_map[cart_hotel.hotel_id]
+
+			# Collect the selected rooms; their status is updated in bulk below
+			matched_rooms = []
+			for room in rooms_by_hotel.get(cart_hotel.name, []):
+				if room.room_rate_id in selected_room_rate_ids:
+					deleted_room_names.append(room.name)
+					matched_rooms.append({
+						"room_id": room.room_id,
+						"room_rate_id": room.room_rate_id,
+						"room_name": room.room_name,
+						"price": float(room.price or 0),
+						"status": "deleted"
+					})
 
-				hotel_data = {
+			# Only build the hotel entry once a room has matched
+			if matched_rooms:
+				deleted_hotels_data.append({
 					"hotel_id": cart_hotel.hotel_id,
 					"hotel_name": cart_hotel.hotel_name,
 					"supplier": cart_hotel.supplier,
-					"rooms": []
-				}
-
-				# Update status for selected rooms to deleted
-				for room in cart_hotel.rooms:
-					if room.room_rate_id in selected_room_rate_ids:
-						room.status = "deleted"
-						deleted_count += 1
-
-						hotel_data["rooms"].append({
-							"room_id": room.room_id,
-							"room_rate_id": room.room_rate_id,
-							"room_name": room.room_name,
-							"price": float(room.price or 0),
-							"status": "deleted"
-						})
+					"rooms": matched_rooms
+				})
 
-				# Save the cart hotel item
-				cart_hotel.save(ignore_permissions=True)
-
-				if hotel_data["rooms"]:
-					deleted_hotels_data.append(hotel_data)
+		deleted_count = len(deleted_room_names)
+		if deleted_room_names:
+			frappe.db.set_value("Cart Hotel Room", {"name": ["in", deleted_room_names]}, "status", "deleted")
 
 		# Update the request booking status based on room statuses
-		new_request_status = update_request_status_from_rooms(booking_doc.name)
+		new_request_status = update_request_status_from_rooms(booking_name)
 
 		frappe.db.commit()
 
@@ -2532,7 +2428,7 @@ def delete_room(request_booking_id, employee, selected_items):
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "delete_room API Error")
+		frappe.log_error(title="delete_room API Error")
 		return {
 				"success": False,
 				"error": str(e)
@@ -2644,19 +2540,6 @@ def update_request_booking(
 	Returns:
 		dict: Response with success status and updated booking data
 	"""
-	# ── Valid options for Select fields ────────────────────────────────────────
-	VALID_REQUEST_STATUS = {
-		"open_request", "offer_pending", "offer_sent",
-		"approval_received", "request_closed", "void"
-	}
-	VALID_PAYMENT_STATUS = {
-		"payment_pending", "payment_failure", "payment_success",
-		"payment_declined", "payment_awaiting", "payment_cancel",
-		"payment_expired", "payment_refunded"
-	}
-	VALID_BUDGET_OPTIONS = {"fixed", "actuals"}
-	VALID_AUTOMATION_STATUS = {"ACTIVE", "PAUSED"}
-
 	try:
 		# Parse hotel_details if it's a string
 		if isinstance(hotel_details, str):
@@ -2716,6 +2599,13 @@ def update_request_booking(
 				"error": f"Invalid automation_status '{automation_status}'. Valid values: ACTIVE, PAUSED"
 			}
 
+		if isinstance(hotel_details, (dict, list)):
+			room_error = _validate_hotel_rooms(
+				[hotel_details] if isinstance(hotel_details, dict) else hotel_details
+			)
+			if room_error:
+				return {"success": False, "error": room_error}
+
 		if preferred_hotels is not None and not isinstance(preferred_hotels, list):
 			return {"success": False, "error": "preferred_hotels must be a list"}
 		if processed_message_ids is not None and not isinstance(processed_message_ids, list):
@@ -2787,74 +2677,66 @@ def update_request_booking(
 		request_booking = frappe.get_doc("Request Booking Details", booking_doc.name)
 
 		# ── Apply field updates (only when explicitly provided) ─────────────────
-		if employee is not None:
-			request_booking.employee = employee
-		if employee_email is not None:
-			request_booking.employee_email = employee_email
-		if phone_number is not None:
-			request_booking.phone_number = phone_number
-		if company is not None:
-			request_booking.company = company
-		if agent is not None:
-			request_booking.agent = agent
-		if request_status is not None:
-			request_booking.request_status = request_status
-		if payment_status is not None:
-			request_booking.payment_status = payment_status
-		if request_source is not None:
-			request_booking.request_source = request_source
-		if request_reference is not None:
-			request_booking.request_reference = request_reference
-		if check_in is not None:
-			request_booking.check_in = getdate(check_in)
-		if check_out is not None:
-			request_booking.check_out = getdate(check_out)
-		if destination is not None:
-			request_booking.destination = destination
-		if destination_code is not None:
-			request_booking.destination_code = destination_code
-		if destination_country is not None:
-			request_booking.destination_country = destination_country
-		if employee_country is not None:
-			request_booking.employee_country = employee_country
-		if work_address is not None:
-			request_booking.work_address = work_address
-		if work_address_latitude is not None:
-			request_booking.work_address_latitude = float(work_address_latitude)
-		if work_address_longitude is not None:
-			request_booking.work_address_longitude = float(work_address_longitude)
-		if room_count is not None:
-			request_booking.room_count = int(room_count)
-		if occupancy is not None:
-			request_booking.occupancy = int(occupancy)
-		if adult_count is not None:
-			request_booking.adult_count = int(adult_count)
-		if child_count is not None:
-			request_booking.child_count = int(child_count)
+		# (fieldname, value, cast) for fields copied straight onto the doc
+		for fieldname, value, cast in (
+			("employee", employee, None),
+			("employee_email", employee_email, None),
+			("phone_number", phone_number, None),
+			("company", company, None),
+			("agent", agent, None),
+			("request_status", request_status, None),
+			("payment_status", payment_status, None),
+			("request_source", request_source, None),
+			("request_reference", request_reference, None),
+			("check_in", check_in, getdate),
+			("check_out", check_out, getdate),
+			("destination", destination, None),
+			("destination_code", destination_code, None),
+			("destination_country", destination_country, None),
+			("employee_country", employee_country, None),
+			("work_address", work_address, None),
+			("work_address_latitude", work_address_latitude, float),
+			("work_address_longitude", work_address_longitude, float),
+			("room_count", room_count, int),
+			("occupancy", occupancy, int),
+			("adult_count", adult_count, int),
+			("child_count", child_count, int),
+		):
+			if value is not None:
+				request_booking.set(fieldname, cast(value) if cast else value)
+		# Parsed child_ages kept for the response so it isn't decoded again
+		child_ages_list = None
 		if child_ages is not None:
 			if isinstance(child_ages, str):
-				child_ages = json.loads(child_ages) if child_ages else []
-			request_booking.child_ages = json.dumps(child_ages) if isinstance(child_ages, list) else child_ages
+				# Parse once to validate; store the caller's JSON string unchanged
+				child_ages_list = json.loads(child_ages) if child_ages else []
+				request_booking.child_ages = child_ages or "[]"
+			elif isinstance(child_ages, list):
+				child_ages_list = child_ages
+				request_booking.child_ages = json.dumps(child_ages)
+			else:
+				request_booking.child_ages = child_ages
 		if budget_amount is not None:
 			request_booking.budget_amount = budget_amount
 			# Mirror store_req_booking: recalculate employee_budget from budget_amount
 			budget_currency = currency if currency else (request_booking.currency or "USD")
 			request_booking.employee_budget = _convert_to_usd(float(budget_amount), budget_currency)
 			request_booking.employee_budget_currency = budget_currency
-		if budget_options is not None:
-			request_booking.budget_options = budget_options
-		if currency is not None:
-			request_booking.currency = currency
-		if employee_budget is not None:
-			request_booking.employee_budget = employee_budget
-		if employee_currency is not None:
-			request_booking.employee_budget_currency = employee_currency
-		if perdiem_amount is not None:
-			request_booking.perdiem_amount = float(perdiem_amount)
-		if perdiem_currency is not None:
-			request_booking.perdiem_currency = perdiem_currency
-		if booking is not None:
-			request_booking.booking = booking
+		# Applied after budget_amount so an explicit employee_budget still wins
+		for fieldname, value, cast in (
+			("budget_options", budget_options, None),
+			("currency", currency, None),
+			("employee_budget", employee_budget, None),
+			("employee_budget_currency", employee_currency, None),
+			("perdiem_amount", perdiem_amount, float),
+			("perdiem_currency", perdiem_currency, None),
+			("booking", booking, None),
+			("automation_status", automation_status, None),
+			("email_subject", email_subject, None),
+			("void_reason", void_reason, None),
+		):
+			if value is not None:
+				request_booking.set(fieldname, cast(value) if cast else value)
 		if itravel_approved is not None:
 			request_booking.itravel_approved = 1 if str(itravel_approved) in ("1", "True") else 0
 		if void is not None:
@@ -2862,10 +2744,6 @@ def update_request_booking(
 			request_booking.void = void_value
 			if void_value == 1:
 				request_booking.request_status = "void"
-		if automation_status is not None:
-			request_booking.automation_status = automation_status
-		if email_subject is not None:
-			request_booking.email_subject = email_subject
 		if preferred_hotels is not None:
 			existing_preferred = json.loads(request_booking.preferred_hotels) if request_booking.preferred_hotels else []
 			merged_preferred = existing_preferred + [item for item in preferred_hotels if item not in existing_preferred]
@@ -2878,8 +2756,6 @@ def update_request_booking(
 			request_booking.missing_mandatory = json.dumps(missing_mandatory)
 		if destination_details is not None:
 			request_booking.destination_details = json.dumps(destination_details) if isinstance(destination_details, (dict, list)) else destination_details
-		if void_reason is not None:
-			request_booking.void_reason = void_reason
 
 		# Date order check (after both dates are resolved)
 		resolved_check_in = request_booking.check_in
@@ -2889,6 +2765,8 @@ def update_request_booking(
 
 		# Handle hotel and room details update
 		new_hotels_data = []
+		created_hotel_items = []
+		rooms_by_item = {}
 		if hotel_details:
 			# Normalize to list
 			hotels_list = []
@@ -2910,8 +2788,6 @@ def update_request_booking(
 				hotel_doc = frappe.get_doc("Cart Hotel Item", item_name)
 				existing_hotels_map[hotel_doc.hotel_id] = hotel_doc
 
-			created_hotel_items = []
-			new_hotels_data = []
 			for hotel_data in hotels_list:
 				hotel_id = hotel_data.get("hotel_id", "")
 				cart_hotel_item = None
@@ -2946,39 +2822,29 @@ def update_request_booking(
 				if "images" in hotel_data:
 					cart_hotel_item.images = json.dumps(hotel_data["images"])
 
-				# Only update rooms if explicitly provided in the payload
+				# Only update rooms if explicitly provided in the payload. Emptying the
+				# child table makes save() drop the old rows in one DELETE; the new rows
+				# are bulk inserted for all hotels after the loop
 				if "rooms" in hotel_data:
 					cart_hotel_item.rooms = []
-					rooms_data = hotel_data["rooms"]
-
-					for room in rooms_data:
-						cp = room.get("cancellation_policy", [])
-						cart_hotel_item.append("rooms", {
-							"room_id": room.get("room_id", ""),
-							"room_rate_id": room.get("room_rate_id", ""),
-							"room_name": room.get("room_name", ""),
-							"room_code": room.get("room_code", ""),
-							"price": room.get("price", 0),
-							"total_price": room.get("total_price", 0),
-							"tax": room.get("tax", 0),
-							"currency": room.get("currency", "USD"),
-							"status": room.get("status", "pending"),
-							"images": json.dumps(room.get("images", [])),
-							"cancellation_policy": json.dumps(cp) if not isinstance(cp, str) else cp,
-							"breakfast_type": room.get("breakfast_type", "")
-						})
-
-					cart_hotel_item.room_count = len(rooms_data)
+					cart_hotel_item.room_count = len(hotel_data["rooms"])
 				cart_hotel_item.save(ignore_permissions=True)
 				created_hotel_items.append(cart_hotel_item.name)
+				if "rooms" in hotel_data:
+					# Keyed by item so a hotel repeated in the payload keeps only its last rooms
+					rooms_by_item[cart_hotel_item.name] = hotel_data["rooms"]
 
 				if is_new_hotel:
 					new_hotels_data.append(hotel_data)
 
+			_bulk_insert_cart_hotel_rooms(rooms_by_item.items())
+
 			# Update the request booking status based on room statuses
 			update_request_status_from_rooms(request_booking.name)
 			# Reload the document to get the updated modified timestamp
 			request_booking.reload()
+			# reload() drops the in-memory child_ages, so read it back from the doc
+			child_ages_list = None
 
 			# Re-apply explicitly passed void/request_status/void_reason after reload (reload loses in-memory changes)
 			if void is not None:
@@ -2991,17 +2857,15 @@ def update_request_booking(
 			if void_reason is not None:
 				request_booking.void_reason = void_reason
 
-			# Link all cart hotel items to the Table MultiSelect field (after reload to preserve changes)
-			if created_hotel_items:
-				request_booking.cart_hotel_item = []  # Clear existing entries
-				for item_name in created_hotel_items:
-					request_booking.append("cart_hotel_item", {
-						"cart_hotel_item": item_name
-					})
-
 		# Save the booking
 		request_booking.save(ignore_permissions=True)
 
+		# Link all cart hotel items to the Table MultiSelect field in bulk (after save,
+		# otherwise save() would drop link rows missing from the in-memory doc)
+		if created_hotel_items:
+			_replace_cart_hotel_item_links(request_booking.name, created_hotel_items)
+			request_booking.reload()
+
 		# Fire-and-forget TripAdvisor URL API call for newly added hotels
 		if hotel_details and new_hotels_data:
 			dest = destination if destination is not None else (booking_doc.destination or "")
@@ -3044,7 +2908,7 @@ def update_request_booking(
 			"occupancy": request_booking.occupancy or 0,
 			"adult_count": request_booking.adult_count or 0,
 			"child_count": request_booking.child_count or 0,
-			"child_ages": json.loads(request_booking.child_ages) if isinstance(request_booking.child_ages, str) and request_booking.child_ages else (request_booking.child_ages or []),
+			"child_ages": child_ages_list if child_ages_list is not None else (json.loads(request_booking.child_ages) if isinstance(request_booking.child_ages, str) and request_booking.child_ages else (request_booking.child_ages or [])),
 			# Budget
 			"budget_amount": request_booking.budget_amount or "",
 			"budget_options": request_booking.budget_options or "",
@@ -3073,7 +2937,7 @@ def update_request_booking(
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "update_request_booking API Error")
+		frappe.log_error(title="update_request_booking API Error")
 		return {
 				"success": False,
 				"error": str(e)
@@ -3249,7 +3113,7 @@ def search_request_bookings(query=None, company=None, status=None, limit=None, r
 		}
 
 	except Exception as e:
-		frappe.log_error(frappe.get_traceback(), "search_request_bookings API Error")
+		frappe.log_error(title="search_request_bookings API Error")
 		return {
 			"success": False,
 			"error": str(e),
@@ -6,19 +6,49 @@ Run tests with:
 
 Or run specific test class:
     bench --site <site-name> run-tests --module destiin.destiin.custom.api.request_booking.test_request --test TestStoreReqBooking
+
+Or split the app's test modules across parallel builds (one site per build):
+    bench --site <site-name> run-parallel-tests --app destiin --build-number <n> --total-builds <total>
 """
 
+import datetime
+import functools
+
 import frappe
-from frappe.tests import IntegrationTestCase
-from frappe.utils import getdate, add_years, today
+from frappe.tests import IntegrationTestCase, UnitTestCase
+from frappe.utils import add_years, today
 from unittest.mock import patch, MagicMock
 import json
 
+from destiin.destiin.custom.api.request_booking import request as _req
+from destiin.destiin.custom.api.request_booking.request import (
+	REQUEST_STATUS_DISPLAY_MAP,
+	_build_booking_response_data,
+	_get_company_display_name,
+	_get_employee_info,
+	_get_hotel_booking_id,
+	approve_booking,
+	decline_booking,
+	format_date_with_ordinal,
+	generate_request_booking_id,
+	get_all_request_bookings,
+	get_hotel_reviews_url,
+	get_next_agent_round_robin,
+	get_ordinal_suffix,
+	get_request_booking_details,
+	get_request_status_from_cart_status,
+	send_for_approval,
+	store_req_booking,
+	update_request_booking,
+	update_request_status_from_rooms,
+)
+
 
 # ---------------------------------------------------------------------------
 # Shared test data helpers
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=None)
 def _ensure_test_company(company_name="_Test Destiin Company", abbr=None):
 	"""Create a test company if it doesn't exist."""
 	if not frappe.db.exists("Company", company_name):
@@ -30,15 +60,20 @@ def _ensure_test_company(company_name="_Test Destiin Company", abbr=None):
 		}
 		if abbr:
 			doc["abbr"] = abbr
-		frappe.get_doc(doc).insert(ignore_permissions=True)
+		company = frappe.get_doc(doc)
+		company.flags.ignore_version = True
+		company.insert(ignore_permissions=True)
 	return company_name
 
 
+@functools.lru_cache(maxsize=None)
 def _ensure_test_employee(company, employee_name="_Test Destiin Employee", email=None):
 	"""Create a test employee if it doesn't exist. Returns employee doc name."""
-	existing = frappe.db.get_value("Employee", {"employee_name": employee_name}, "name")
+	existing = frappe.get_all(
+		"Employee", filters={"employee_name": employee_name}, pluck="name", limit=1
+	)
 	if existing:
-		return existing
+		return existing[0]
 	emp = frappe.get_doc({
 		"doctype": "Employee",
 		"employee_name": employee_name,
@@ -49,20 +84,89 @@ def _ensure_test_employee(company, employee_name="_Test Destiin Employee", email
 		"date_of_joining": "2020-01-01",
 		"company_email": email or "",
 	})
+	emp.flags.ignore_version = True
 	emp.insert(ignore_permissions=True)
 	return emp.name
 
 
 def _cleanup_test_booking(request_booking_id):
 	"""Delete a Request Booking Details and its linked Cart Hotel Items if they exist."""
-	name = frappe.db.get_value(
-		"Request Booking Details", {"request_booking_id": request_booking_id}, "name"
+	# Cart Hotel Items and their rooms in one statement
+	frappe.db.sql("""
+		DELETE chi, chr
+		FROM `tabCart Hotel Item` chi
+		LEFT JOIN `tabCart Hotel Room` chr
+			ON chr.parent = chi.name AND chr.parenttype = 'Cart Hotel Item'
+		WHERE chi.request_booking IN (
+			SELECT name FROM `tabRequest Booking Details` WHERE request_booking_id = %s
+		)
+	""", (request_booking_id,))
+	# The booking and its cart_hotel_item link rows
+	frappe.db.sql("""
+		DELETE rbd, link
+		FROM `tabRequest Booking Details` rbd
+		LEFT JOIN `tabCart Hotel Item Link` link
+			ON link.parent = rbd.name AND link.parenttype = 'Request Booking Details'
+		WHERE rbd.request_booking_id = %s
+	""", (request_booking_id,))
+
+
+def _bulk_seed_booking(booking, hotels=()):
+	"""
+	Seed a Request Booking Details row plus its Cart Hotel Items and rooms with
+	one bulk INSERT per table, skipping the ORM hooks and autonaming.
+	The booking is named after its request_booking_id, which is returned.
+	"""
+	now = frappe.utils.now()
+	user = frappe.session.user
+	audit_fields = ["creation", "modified", "owner", "modified_by"]
+	audit_values = (now, now, user, user)
+
+	booking_name = booking["request_booking_id"]
+	frappe.db.bulk_insert(
+		"Request Booking Details",
+		fields=["name", *booking, *audit_fields],
+		values=[(booking_name, *booking.values(), *audit_values)]
 	)
-	if not name:
-		return
-	for chi in frappe.get_all("Cart Hotel Item", filters={"request_booking": name}, pluck="name"):
-		frappe.delete_doc("Cart Hotel Item", chi, force=True, ignore_permissions=True)
-	frappe.delete_doc("Request Booking Details", name, force=True, ignore_permissions=True)
+
+	hotel_rows = []
+	room_rows = []
+	for hotel in hotels:
+		hotel_name = frappe.generate_hash(length=10)
+		rooms = hotel.get("rooms", [])
+		hotel_rows.append((
+			hotel_name, booking_name, hotel["hotel_id"], hotel["hotel_name"],
+			hotel.get("supplier", ""), hotel.get("meal_plan", ""),
+			hotel.get("cancellation_policy", ""), len(rooms), *audit_values
+		))
+		for idx, room in enumerate(rooms, start=1):
+			room_rows.append((
+				frappe.generate_hash(length=10), hotel_name, "Cart Hotel Item", "rooms", idx,
+				room["room_id"], room["room_rate_id"], room["room_name"],
+				room.get("price", 0), room.get("total_price", 0), room.get("tax", 0),
+				room.get("currency"), room.get("status", "pending"), *audit_values
+			))
+
+	if hotel_rows:
+		frappe.db.bulk_insert(
+			"Cart Hotel Item",
+			fields=[
+				"name", "request_booking", "hotel_id", "hotel_name", "supplier",
+				"meal_plan", "cancellation_policy", "room_count", *audit_fields
+			],
+			values=hotel_rows
+		)
+	if room_rows:
+		frappe.db.bulk_insert(
+			"Cart Hotel Room",
+			fields=[
+				"name", "parent", "parenttype", "parentfield", "idx",
+				"room_id", "room_rate_id", "room_name", "price", "total_price",
+				"tax", "currency", "status", *audit_fields
+			],
+			values=room_rows
+		)
+	return booking_name
 
 
 def _make_hotel_details(hotel_id="HTL001", hotel_name="Test Hotel", rooms=None):
@@ -98,56 +202,116 @@ def _make_hotel_details(hotel_id="HTL001", hotel_name="Test Hotel", rooms=None):
 	}
 
 
+# Dates used by the pure helper tests, built once instead of parsed per test
+_JAN_15_2026 = datetime.date(2026, 1, 15)
+_MAR_01_2026 = datetime.date(2026, 3, 1)
+_MAR_05_2026 = datetime.date(2026, 3, 5)
+_DEC_22_2026 = datetime.date(2026, 12, 22)
+
+
+# Currency conversion API response, built once and reused by the budget tests
+_CONV_RESP = MagicMock(status_code=200, text='{"status": true, "data": {"converted": 75.0}}')
+_CONV_RESP.json.return_value = {"status": True, "data": {"converted": 75.0}}
+
+
+# Keys every get_all_request_bookings row must carry
+EXPECTED_BOOKING_FIELDS = frozenset({
+	"request_booking_id", "booking_id", "user_name", "hotels",
+	"destination", "check_in", "check_out", "status", "status_code",
+	"rooms_count", "guests_count", "company", "employee",
+	"request_created_date", "request_created_time"
+})
+
+
+# Frappe flags overridden for the module, with the values to restore afterwards
+_MODULE_FLAGS = {"mute_emails": True, "print_messages": False}
+_saved_flags = {}
+
+
+def setUpModule():
+	# No outgoing mail or msgprint formatting is needed by any test here
+	for flag, value in _MODULE_FLAGS.items():
+		_saved_flags[flag] = frappe.flags.get(flag)
+		frappe.flags[flag] = value
+
+
+def tearDownModule():
+	frappe.flags.update(_saved_flags)
+	_saved_flags.clear()
+
+
+class _BookingTestBase(IntegrationTestCase):
+	"""Base for test classes that need the shared test company and employee."""
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		# Created after the base class commit, so the class rollback removes them again
+		cls.company = _ensure_test_company("_Test Destiin Shared Co", abbr="TDSC")
+		cls.employee = _ensure_test_employee(cls.company, "_Test Destiin Shared Emp")
+
+	@classmethod
+	def tearDownClass(cls):
+		# The class rollback discards the fixtures, so drop their cached names too
+		_ensure_test_company.cache_clear()
+		_ensure_test_employee.cache_clear()
+		super().tearDownClass()
+
+
+class _SeededBookingTestCase(_BookingTestBase):
+	"""
+	Base for test classes that work against one seeded booking.
+	Subclasses set BOOKING (Request Booking Details fields) and optionally
+	HOTELS (Cart Hotel Items with their rooms); the shared company and
+	employee are filled in here.
+	"""
+
+	BOOKING = None
+	HOTELS = ()
+
+	@classmethod
+	def setUpClass(cls):
+		super().setUpClass()
+		_cleanup_test_booking(cls.BOOKING["request_booking_id"])
+		cls.booking_name = _bulk_seed_booking(
+			{**cls.BOOKING, "employee": cls.employee, "company": cls.company},
+			hotels=cls.HOTELS
+		)
+
+
 # ---------------------------------------------------------------------------
 # Test: Helper / Utility Functions
 # ---------------------------------------------------------------------------
 
-class TestHelperFunctions(IntegrationTestCase):
+class TestHelperFunctions(UnitTestCase):
 	"""Test pure utility functions that don't need DB state."""
 
 	def test_get_ordinal_suffix(self):
-		from destiin.destiin.custom.api.request_booking.request import get_ordinal_suffix
-		self.assertEqual(get_ordinal_suffix(1), "st")
-		self.assertEqual(get_ordinal_suffix(2), "nd")
-		self.assertEqual(get_ordinal_suffix(3), "rd")
-		self.assertEqual(get_ordinal_suffix(4), "th")
-		self.assertEqual(get_ordinal_suffix(11), "th")
-		self.assertEqual(get_ordinal_suffix(12), "th")
-		self.assertEqual(get_ordinal_suffix(13), "th")
-		self.assertEqual(get_ordinal_suffix(21), "st")
-		self.assertEqual(get_ordinal_suffix(22), "nd")
-		self.assertEqual(get_ordinal_suffix(23), "rd")
+		cases = {1: "st", 2: "nd", 3: "rd", 4: "th", 11: "th", 12: "th", 13: "th", 21: "st", 22: "nd", 23: "rd"}
+		for n, expected in cases.items():
+			with self.subTest(n=n):
+				self.assertEqual(get_ordinal_suffix(n), expected)
 
 	def test_format_date_with_ordinal(self):
-		from destiin.destiin.custom.api.request_booking.request import format_date_with_ordinal
-		d = getdate("2026-01-15")
-		self.assertEqual(format_date_with_ordinal(d), "15th_Jan_2026")
-
-		d2 = getdate("2026-03-01")
-		self.assertEqual(format_date_with_ordinal(d2), "1st_Mar_2026")
-
-		d3 = getdate("2026-12-22")
-		self.assertEqual(format_date_with_ordinal(d3), "22nd_Dec_2026")
+		self.assertEqual(format_date_with_ordinal(_JAN_15_2026), "15th_Jan_2026")
+		self.assertEqual(format_date_with_ordinal(_MAR_01_2026), "1st_Mar_2026")
+		self.assertEqual(format_date_with_ordinal(_DEC_22_2026), "22nd_Dec_2026")
 
 	def test_generate_request_booking_id(self):
-		from destiin.destiin.custom.api.request_booking.request import generate_request_booking_id
 		bid = generate_request_booking_id("EMP001", "2026-01-15", "2026-01-20")
 		self.assertEqual(bid, "EMP001_15th_Jan_2026-20th_Jan_2026")
 
 	def test_get_hotel_reviews_url_with_value(self):
-		from destiin.destiin.custom.api.request_booking.request import get_hotel_reviews_url
 		url = get_hotel_reviews_url("https://tripadvisor.com/hotel123", "Hotel X", "Paris")
 		self.assertEqual(url, "https://tripadvisor.com/hotel123")
 
 	def test_get_hotel_reviews_url_fallback(self):
-		from destiin.destiin.custom.api.request_booking.request import get_hotel_reviews_url
 		url = get_hotel_reviews_url("", "Grand Hotel", "Sydney")
 		self.assertIn("google.com/search", url)
 		self.assertIn("tripadvisor", url)
 		self.assertIn("Grand", url)
 
 	def test_get_request_status_from_cart_status(self):
-		from destiin.destiin.custom.api.request_booking.request import get_request_status_from_cart_status
 		self.assertEqual(get_request_status_from_cart_status("pending"), "offer_pending")
 		self.assertEqual(get_request_status_from_cart_status("approved"), "approval_received")
 		self.assertEqual(get_request_status_from_cart_status("payment_success"), "req_payment_success")
@@ -156,7 +320,6 @@ class TestHelperFunctions(IntegrationTestCase):
 		self.assertEqual(get_request_status_from_cart_status("unknown_xyz"), "offer_pending")
 
 	def test_request_status_display_map(self):
-		from destiin.destiin.custom.api.request_booking.request import REQUEST_STATUS_DISPLAY_MAP
 		status, code = REQUEST_STATUS_DISPLAY_MAP["offer_pending"]
 		self.assertEqual(status, "pending_in_cart")
 		self.assertEqual(code, 0)
@@ -165,7 +328,6 @@ class TestHelperFunctions(IntegrationTestCase):
 		self.assertEqual(code, 5)
 
 	def test_build_booking_response_data(self):
-		from destiin.destiin.custom.api.request_booking.request import _build_booking_response_data
 		# Create a mock request object
 		req = frappe._dict({
 			"request_booking_id": "TEST_001",
@@ -175,8 +337,8 @@ class TestHelperFunctions(IntegrationTestCase):
 			"budget_options": "fixed",
 			"employee_budget": 1000.0,
 			"work_address": "123 Street",
-			"check_in": getdate("2026-03-01"),
-			"check_out": getdate("2026-03-05"),
+			"check_in": _MAR_01_2026,
+			"check_out": _MAR_05_2026,
 			"request_status": "offer_pending",
 			"room_count": 1,
 			"adult_count": 2,
@@ -203,24 +365,12 @@ class TestHelperFunctions(IntegrationTestCase):
 # Test: store_req_booking
 # ---------------------------------------------------------------------------
 
-class TestStoreReqBooking(IntegrationTestCase):
+@patch.object(_req, "_fire_tripadvisor_url_api")
+class TestStoreReqBooking(_BookingTestBase):
 	"""Test the store_req_booking API."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Store Booking Co", abbr="TSBC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test Store Emp")
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
-
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
 	def test_create_new_booking_minimal(self, mock_trip):
-		"""Create a booking with only required fields."""
-		from destiin.destiin.custom.api.request_booking.request import store_req_booking
+		"""Create a booking with only required fields; it gets a round-robin agent."""
 		result = store_req_booking(
 			employee=self.employee,
 			check_in="2026-10-01",
@@ -230,12 +380,11 @@ class TestStoreReqBooking(IntegrationTestCase):
 		self.assertIn("request_booking_id", result["data"])
 		self.assertEqual(result["data"]["employee"], self.employee)
 		self.assertTrue(result["data"]["is_new"])
+		# Agent may or may not be set depending on test env, but field should exist
+		self.assertIn("agent", result["data"])
 
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
 	def test_create_booking_with_hotel_details(self, mock_trip):
 		"""Create a booking with hotel and room details."""
-		from destiin.destiin.custom.api.request_booking.request import store_req_booking
-		hotel = _make_hotel_details("HTL_STORE_001", "Store Test Hotel")
 		result = store_req_booking(
 			employee=self.employee,
 			check_in="2026-10-10",
@@ -245,17 +394,15 @@ class TestStoreReqBooking(IntegrationTestCase):
 			adult_count=2,
 			child_count=0,
 			room_count=1,
-			hotel_details=json.dumps(hotel)
+			hotel_details=json.dumps(_make_hotel_details("HTL_STORE_001", "Store Test Hotel"))
 		)
 		self.assertTrue(result["success"])
 		self.assertEqual(result["data"]["hotel_count"], 1)
 		self.assertEqual(len(result["data"]["cart_hotel_items"]), 1)
 		mock_trip.assert_called_once()
 
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
 	def test_create_booking_with_multiple_hotels(self, mock_trip):
 		"""Create a booking with multiple hotels."""
-		from destiin.destiin.custom.api.request_booking.request import store_req_booking
 		hotels = [
 			_make_hotel_details("HTL_MULTI_A", "Hotel A"),
 			_make_hotel_details("HTL_MULTI_B", "Hotel B"),
@@ -269,10 +416,27 @@ class TestStoreReqBooking(IntegrationTestCase):
 		self.assertTrue(result["success"])
 		self.assertEqual(result["data"]["hotel_count"], 2)
 
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
+	def test_create_booking_with_invalid_room_currency(self, mock_trip):
+		"""An unknown room currency is rejected before the booking is created."""
+		rooms = [{
+			"room_id": "RM_BAD_CUR",
+			"room_rate_id": "RR_BAD_CUR",
+			"room_name": "Deluxe Room",
+			"price": 5000,
+			"currency": "NOT_A_CURRENCY"
+		}]
+		result = store_req_booking(
+			employee=self.employee,
+			check_in="2026-11-10",
+			check_out="2026-11-15",
+			hotel_details=json.dumps(_make_hotel_details("HTL_BAD_CUR", "Bad Currency Hotel", rooms=rooms))
+		)
+		self.assertFalse(result["success"])
+		self.assertIn("NOT_A_CURRENCY", result["error"])
+		self.assertFalse(frappe.db.exists("Cart Hotel Room", {"room_rate_id": "RR_BAD_CUR"}))
+
 	def test_duplicate_booking_returns_error(self, mock_trip):
 		"""Calling store_req_booking twice with same dates returns error."""
-		from destiin.destiin.custom.api.request_booking.request import store_req_booking
 		store_req_booking(
 			employee=self.employee,
 			check_in="2026-11-01",
@@ -286,16 +450,10 @@ class TestStoreReqBooking(IntegrationTestCase):
 		self.assertFalse(result["success"])
 		self.assertIn("already exists", result["message"])
 
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
-	@patch("destiin.destiin.custom.api.request_booking.request.requests.get")
+	@patch.object(_req._api_session, "get")
 	def test_create_booking_with_budget_conversion(self, mock_get, mock_trip):
 		"""Budget in non-USD currency triggers conversion API."""
-		from destiin.destiin.custom.api.request_booking.request import store_req_booking
-		mock_response = MagicMock()
-		mock_response.status_code = 200
-		mock_response.json.return_value = {"status": True, "data": {"converted": 75.0}}
-		mock_response.text = '{"status": true, "data": {"converted": 75.0}}'
-		mock_get.return_value = mock_response
+		mock_get.return_value = _CONV_RESP
 
 		result = store_req_booking(
 			employee=self.employee,
@@ -309,93 +467,54 @@ class TestStoreReqBooking(IntegrationTestCase):
 		self.assertEqual(result["data"]["employee_budget"], 300.0)
 		mock_get.assert_called_once()
 
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
-	def test_create_booking_assigns_agent(self, mock_trip):
-		"""New booking should get an agent assigned via round-robin."""
-		from destiin.destiin.custom.api.request_booking.request import store_req_booking
-		result = store_req_booking(
-			employee=self.employee,
-			check_in="2026-12-01",
-			check_out="2026-12-05"
-		)
-		self.assertTrue(result["success"])
-		# Agent may or may not be set depending on test env, but field should exist
-		self.assertIn("agent", result["data"])
-
 
 # ---------------------------------------------------------------------------
 # Test: get_all_request_bookings
 # ---------------------------------------------------------------------------
 
-class TestGetAllRequestBookings(IntegrationTestCase):
+class TestGetAllRequestBookings(_SeededBookingTestCase):
 	"""Test the get_all_request_bookings API."""
 
+	BOOKING = {
+		"request_booking_id": "GETALL_TEST_001",
+		"check_in": "2026-06-01",
+		"check_out": "2026-06-05",
+		"occupancy": 2,
+		"adult_count": 2,
+		"child_count": 0,
+		"room_count": 1,
+		"request_status": "offer_pending",
+		"destination": "Paris",
+		"destination_code": "PAR",
+	}
+
 	@classmethod
 	def setUpClass(cls):
 		super().setUpClass()
-		cls.company = _ensure_test_company("_Test GetAll Co", abbr="TGAC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test GetAll Emp")
-		_cleanup_test_booking("GETALL_TEST_001")
-		# Create a booking for testing
-		cls.booking_doc = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": "GETALL_TEST_001",
-			"employee": cls.employee,
-			"company": cls.company,
-			"check_in": "2026-06-01",
-			"check_out": "2026-06-05",
-			"occupancy": 2,
-			"adult_count": 2,
-			"child_count": 0,
-			"room_count": 1,
-			"request_status": "offer_pending",
-			"destination": "Paris",
-			"destination_code": "PAR",
-		})
-		cls.booking_doc.insert(ignore_permissions=True)
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+		# Unfiltered listing shared by the no-filter and structure checks
+		cls.all_result = get_all_request_bookings()
 
 	def test_get_all_without_filters(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
-		result = get_all_request_bookings()
+		result = self.all_result
 		self.assertTrue(result["success"])
 		self.assertIsInstance(result["data"], list)
 		self.assertIn("pagination", result)
 
-	def test_filter_by_company(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
-		result = get_all_request_bookings(company=self.company)
-		self.assertTrue(result["success"])
-		for bk in result["data"]:
-			self.assertEqual(bk["company"]["id"], self.company)
-
-	def test_filter_by_employee(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
-		result = get_all_request_bookings(employee=self.employee)
-		self.assertTrue(result["success"])
-		for bk in result["data"]:
-			self.assertEqual(bk["employee"]["id"], self.employee)
-
-	def test_filter_by_status(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
-		result = get_all_request_bookings(status="offer_pending")
-		self.assertTrue(result["success"])
-		for bk in result["data"]:
-			self.assertEqual(bk["status"], "pending_in_cart")
-
-	def test_filter_by_multiple_statuses(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
-		result = get_all_request_bookings(status="offer_pending,approval_received")
-		self.assertTrue(result["success"])
-		for bk in result["data"]:
-			self.assertIn(bk["status"], ["pending_in_cart", "approved"])
+	def test_filter_variants(self):
+		# (filter kwargs, value read from each row, values the rows may carry)
+		cases = (
+			({"company": self.company}, lambda bk: bk["company"]["id"], {self.company}),
+			({"employee": self.employee}, lambda bk: bk["employee"]["id"], {self.employee}),
+			({"status": "offer_pending"}, lambda bk: bk["status"], {"pending_in_cart"}),
+			({"status": "offer_pending,approval_received"}, lambda bk: bk["status"], {"pending_in_cart", "approved"}),
+		)
+		for kwargs, value, allowed in cases:
+			with self.subTest(**kwargs):
+				result = get_all_request_bookings(**kwargs)
+				self.assertTrue(result["success"])
+				self.assertLessEqual({value(bk) for bk in result["data"]}, allowed)
 
 	def test_pagination(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
 		result = get_all_request_bookings(page=1, page_size=1)
 		self.assertTrue(result["success"])
 		self.assertLessEqual(len(result["data"]), 1)
@@ -404,93 +523,66 @@ class TestGetAllRequestBookings(IntegrationTestCase):
 		self.assertEqual(pagination["page_size"], 1)
 
 	def test_empty_results(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
 		result = get_all_request_bookings(company="NonExistent_XYZ_Company")
 		self.assertTrue(result["success"])
 		self.assertEqual(len(result["data"]), 0)
 		self.assertEqual(result["pagination"]["total_count"], 0)
 
 	def test_response_structure(self):
-		from destiin.destiin.custom.api.request_booking.request import get_all_request_bookings
-		result = get_all_request_bookings(company=self.company)
+		# The seeded booking guarantees at least one row
+		bk = self.all_result["data"][0]
+		self.assertGreaterEqual(bk.keys(), EXPECTED_BOOKING_FIELDS)
+
+	def test_res_payload_limits_keys(self):
+		result = get_all_request_bookings(res_payload=["request_booking_id", "status"])
 		self.assertTrue(result["success"])
-		if result["data"]:
-			bk = result["data"][0]
-			expected_keys = [
-				"request_booking_id", "booking_id", "user_name", "hotels",
-				"destination", "check_in", "check_out", "status", "status_code",
-				"rooms_count", "guests_count", "company", "employee",
-				"request_created_date", "request_created_time"
-			]
-			for key in expected_keys:
-				self.assertIn(key, bk, f"Missing key: {key}")
+		for bk in result["data"]:
+			self.assertEqual(bk.keys(), {"request_booking_id", "status"})
 
 
 # ---------------------------------------------------------------------------
 # Test: get_request_booking_details
 # ---------------------------------------------------------------------------
 
-class TestGetRequestBookingDetails(IntegrationTestCase):
+class TestGetRequestBookingDetails(_SeededBookingTestCase):
 	"""Test the get_request_booking_details API."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Detail Co", abbr="TDTC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test Detail Emp")
-		_cleanup_test_booking("DETAIL_TEST_001")
-		cls.booking_doc = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": "DETAIL_TEST_001",
-			"employee": cls.employee,
-			"company": cls.company,
-			"check_in": "2026-07-01",
-			"check_out": "2026-07-05",
-			"occupancy": 2,
-			"adult_count": 2,
-			"room_count": 1,
-			"request_status": "offer_pending",
-			"destination": "Tokyo",
-		})
-		cls.booking_doc.insert(ignore_permissions=True)
-
-		# Create a Cart Hotel Item linked to this booking
-		cls.cart_hotel = frappe.get_doc({
-			"doctype": "Cart Hotel Item",
-			"request_booking": cls.booking_doc.name,
-			"hotel_id": "HTL_DETAIL_001",
-			"hotel_name": "Detail Test Hotel",
-			"supplier": "Direct",
-			"meal_plan": "BB",
-			"rooms": [
-				{
-					"room_id": "RM_D_001",
-					"room_rate_id": "RR_D_001",
-					"room_name": "Standard",
-					"price": 100,
-					"total_price": 110,
-					"tax": 10,
-					"currency": "USD",
-					"status": "pending"
-				}
-			]
-		})
-		cls.cart_hotel.insert(ignore_permissions=True)
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	BOOKING = {
+		"request_booking_id": "DETAIL_TEST_001",
+		"check_in": "2026-07-01",
+		"check_out": "2026-07-05",
+		"occupancy": 2,
+		"adult_count": 2,
+		"room_count": 1,
+		"request_status": "offer_pending",
+		"destination": "Tokyo",
+	}
+	HOTELS = [{
+		"hotel_id": "HTL_DETAIL_001",
+		"hotel_name": "Detail Test Hotel",
+		"supplier": "Direct",
+		"meal_plan": "BB",
+		"rooms": [
+			{
+				"room_id": "RM_D_001",
+				"room_rate_id": "RR_D_001",
+				"room_name": "Standard",
+				"price": 100,
+				"total_price": 110,
+				"tax": 10,
+				"currency": "USD",
+				"status": "pending"
+			}
+		]
+	}]
 
 	def test_get_existing_booking(self):
-		from destiin.destiin.custom.api.request_booking.request import get_request_booking_details
 		result = get_request_booking_details("DETAIL_TEST_001")
 		self.assertTrue(result["success"])
 		self.assertEqual(result["data"]["request_booking_id"], "DETAIL_TEST_001")
 		self.assertEqual(result["data"]["destination"], "Tokyo")
 
 	def test_get_booking_includes_hotels(self):
-		from destiin.destiin.custom.api.request_booking.request import get_request_booking_details
 		result = get_request_booking_details("DETAIL_TEST_001")
 		self.assertTrue(result["success"])
 		hotels = result["data"]["hotels"]
@@ -499,13 +591,11 @@ class TestGetRequestBookingDetails(IntegrationTestCase):
 		self.assertGreaterEqual(len(hotels[0]["rooms"]), 1)
 
 	def test_nonexistent_booking(self):
-		from destiin.destiin.custom.api.request_booking.request import get_request_booking_details
 		result = get_request_booking_details("NONEXISTENT_99999")
 		self.assertFalse(result["success"])
 		self.assertIn("error", result)
 
 	def test_missing_booking_id(self):
-		from destiin.destiin.custom.api.request_booking.request import get_request_booking_details
 		result = get_request_booking_details("")
 		self.assertFalse(result["success"])
 		self.assertIn("error", result)
@@ -515,37 +605,22 @@ class TestGetRequestBookingDetails(IntegrationTestCase):
 # Test: update_request_booking
 # ---------------------------------------------------------------------------
 
-class TestUpdateRequestBooking(IntegrationTestCase):
+@patch.object(_req, "_fire_tripadvisor_url_api")
+class TestUpdateRequestBooking(_SeededBookingTestCase):
 	"""Test the update_request_booking API."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Update Co", abbr="TUPC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test Update Emp")
-		_cleanup_test_booking("UPDATE_TEST_001")
-		cls.booking_doc = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": "UPDATE_TEST_001",
-			"employee": cls.employee,
-			"company": cls.company,
-			"check_in": "2026-08-01",
-			"check_out": "2026-08-05",
-			"occupancy": 2,
-			"adult_count": 2,
-			"room_count": 1,
-			"request_status": "offer_pending",
-			"destination": "Berlin",
-		})
-		cls.booking_doc.insert(ignore_permissions=True)
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	BOOKING = {
+		"request_booking_id": "UPDATE_TEST_001",
+		"check_in": "2026-08-01",
+		"check_out": "2026-08-05",
+		"occupancy": 2,
+		"adult_count": 2,
+		"room_count": 1,
+		"request_status": "offer_pending",
+		"destination": "Berlin",
+	}
 
-	def test_update_basic_fields(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_booking
+	def test_update_basic_fields(self, mock_trip):
 		result = update_request_booking(
 			request_booking_id="UPDATE_TEST_001",
 			destination="Munich",
@@ -557,25 +632,40 @@ class TestUpdateRequestBooking(IntegrationTestCase):
 		self.assertEqual(result["data"]["occupancy"], 4)
 		self.assertEqual(result["data"]["adult_count"], 3)
 
-	@patch("destiin.destiin.custom.api.request_booking.request._fire_tripadvisor_url_api")
 	def test_update_with_hotel_details(self, mock_trip):
-		from destiin.destiin.custom.api.request_booking.request import update_request_booking
-		hotel = _make_hotel_details("HTL_UPD_001", "Update Hotel")
 		result = update_request_booking(
 			request_booking_id="UPDATE_TEST_001",
-			hotel_details=json.dumps(hotel)
+			hotel_details=json.dumps(_make_hotel_details("HTL_UPD_001", "Update Hotel"))
 		)
 		self.assertTrue(result["success"])
 		mock_trip.assert_called_once()
 
-	def test_update_nonexistent_booking(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_booking
+	def test_update_with_invalid_room_status_and_currency(self, mock_trip):
+		"""Unknown room status/currency are rejected before any room is written."""
+		for field, value in (("status", "Approved"), ("currency", "NOT_A_CURRENCY")):
+			with self.subTest(field=field):
+				rooms = [{
+					"room_id": "RM_BAD_001",
+					"room_rate_id": "RR_BAD_001",
+					"room_name": "Deluxe Room",
+					"price": 5000,
+					"currency": "USD",
+					field: value
+				}]
+				result = update_request_booking(
+					request_booking_id="UPDATE_TEST_001",
+					hotel_details=json.dumps(_make_hotel_details("HTL_UPD_BAD", "Bad Room Hotel", rooms=rooms))
+				)
+				self.assertFalse(result["success"])
+				self.assertIn(value, result["error"])
+				self.assertFalse(frappe.db.exists("Cart Hotel Room", {"room_rate_id": "RR_BAD_001"}))
+
+	def test_update_nonexistent_booking(self, mock_trip):
 		result = update_request_booking(request_booking_id="NONEXISTENT_UPD_999")
 		self.assertFalse(result["success"])
 		self.assertIn("error", result)
 
-	def test_update_requires_identifier(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_booking
+	def test_update_requires_identifier(self, mock_trip):
 		result = update_request_booking(request_booking_id="", name=None)
 		self.assertFalse(result["success"])
 
@@ -584,74 +674,51 @@ class TestUpdateRequestBooking(IntegrationTestCase):
 # Test: send_for_approval
 # ---------------------------------------------------------------------------
 
-class TestSendForApproval(IntegrationTestCase):
+class TestSendForApproval(_SeededBookingTestCase):
 	"""Test the send_for_approval API."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Approval Co", abbr="TAPC")
-		cls.employee = _ensure_test_employee(
-			cls.company, "_Test Approval Emp", email="approval@test.com"
-		)
-		_cleanup_test_booking("APPROVAL_TEST_001")
-		cls.booking_doc = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": "APPROVAL_TEST_001",
-			"employee": cls.employee,
-			"employee_email": "approval@test.com",
-			"company": cls.company,
-			"check_in": "2026-09-01",
-			"check_out": "2026-09-05",
-			"adult_count": 2,
-			"room_count": 1,
-			"request_status": "offer_pending",
-			"destination": "London",
-		})
-		cls.booking_doc.insert(ignore_permissions=True)
-
-		cls.cart_hotel = frappe.get_doc({
-			"doctype": "Cart Hotel Item",
-			"request_booking": cls.booking_doc.name,
-			"hotel_id": "HTL_APP_001",
-			"hotel_name": "Approval Hotel",
-			"supplier": "Direct",
-			"meal_plan": "BB",
-			"cancellation_policy": "Free",
-			"rooms": [
-				{
-					"room_id": "RM_A_001",
-					"room_rate_id": "RR_A_001",
-					"room_name": "Standard",
-					"price": 200,
-					"total_price": 220,
-					"tax": 20,
-					"currency": "USD",
-					"status": "pending"
-				},
-				{
-					"room_id": "RM_A_002",
-					"room_rate_id": "RR_A_002",
-					"room_name": "Deluxe",
-					"price": 300,
-					"total_price": 330,
-					"tax": 30,
-					"currency": "USD",
-					"status": "pending"
-				}
-			]
-		})
-		cls.cart_hotel.insert(ignore_permissions=True)
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	BOOKING = {
+		"request_booking_id": "APPROVAL_TEST_001",
+		"employee_email": "approval@test.com",
+		"check_in": "2026-09-01",
+		"check_out": "2026-09-05",
+		"adult_count": 2,
+		"room_count": 1,
+		"request_status": "offer_pending",
+		"destination": "London",
+	}
+	HOTELS = [{
+		"hotel_id": "HTL_APP_001",
+		"hotel_name": "Approval Hotel",
+		"supplier": "Direct",
+		"meal_plan": "BB",
+		"cancellation_policy": "Free",
+		"rooms": [
+			{
+				"room_id": "RM_A_001",
+				"room_rate_id": "RR_A_001",
+				"room_name": "Standard",
+				"price": 200,
+				"total_price": 220,
+				"tax": 20,
+				"currency": "USD",
+				"status": "pending"
+			},
+			{
+				"room_id": "RM_A_002",
+				"room_rate_id": "RR_A_002",
+				"room_name": "Deluxe",
+				"price": 300,
+				"total_price": 330,
+				"tax": 30,
+				"currency": "USD",
+				"status": "pending"
+			}
+		]
+	}]
 
-	@patch("destiin.destiin.custom.api.request_booking.request.send_email_via_api")
+	@patch.object(_req, "_fire_approval_email")
 	def test_send_for_approval_success(self, mock_email):
-		from destiin.destiin.custom.api.request_booking.request import send_for_approval
-		mock_email.return_value = {"success": True}
 		result = send_for_approval(
 			request_booking_id="APPROVAL_TEST_001",
 			selected_items=json.dumps([{
@@ -661,90 +728,50 @@ class TestSendForApproval(IntegrationTestCase):
 		)
 		self.assertTrue(result["success"])
 		self.assertEqual(result["data"]["updated_count"], 1)
-		self.assertTrue(result["data"]["email_sent"])
-
-	def test_send_for_approval_missing_booking_id(self):
-		from destiin.destiin.custom.api.request_booking.request import send_for_approval
-		result = send_for_approval(
-			request_booking_id="",
-			selected_items=[{"hotel_id": "HTL001", "room_rate_ids": ["RR001"]}]
-		)
-		self.assertFalse(result["success"])
-
-	def test_send_for_approval_nonexistent_booking(self):
-		from destiin.destiin.custom.api.request_booking.request import send_for_approval
-		result = send_for_approval(
-			request_booking_id="NONEXISTENT_APP_999",
-			selected_items=[{"hotel_id": "HTL001", "room_rate_ids": ["RR001"]}]
-		)
-		self.assertFalse(result["success"])
-
-	def test_send_for_approval_empty_items(self):
-		from destiin.destiin.custom.api.request_booking.request import send_for_approval
-		result = send_for_approval(
-			request_booking_id="APPROVAL_TEST_001",
-			selected_items="[]"
-		)
-		self.assertFalse(result["success"])
+		self.assertTrue(result["data"]["email_queued"])
+		mock_email.assert_called_once()
+		body_args = mock_email.call_args.args[2]
+		self.assertEqual(body_args["request_booking_id"], "APPROVAL_TEST_001")
+		self.assertEqual(body_args["number_of_hotel_options"], 1)
 
 
 # ---------------------------------------------------------------------------
 # Test: approve_booking
 # ---------------------------------------------------------------------------
 
-class TestApproveBooking(IntegrationTestCase):
+class TestApproveBooking(_SeededBookingTestCase):
 	"""Test the approve_booking API."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Approve Co", abbr="TARC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test Approve Emp")
-		_cleanup_test_booking("APPROVE_TEST_001")
-		cls.booking_doc = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": "APPROVE_TEST_001",
-			"employee": cls.employee,
-			"company": cls.company,
-			"check_in": "2026-09-10",
-			"check_out": "2026-09-15",
-			"room_count": 1,
-			"request_status": "offer_sent",
-		})
-		cls.booking_doc.insert(ignore_permissions=True)
-
-		cls.cart_hotel = frappe.get_doc({
-			"doctype": "Cart Hotel Item",
-			"request_booking": cls.booking_doc.name,
-			"hotel_id": "HTL_APR_001",
-			"hotel_name": "Approve Hotel",
-			"supplier": "Direct",
-			"rooms": [
-				{
-					"room_id": "RM_APR_001",
-					"room_rate_id": "RR_APR_001",
-					"room_name": "Standard",
-					"price": 150,
-					"status": "sent_for_approval"
-				},
-				{
-					"room_id": "RM_APR_002",
-					"room_rate_id": "RR_APR_002",
-					"room_name": "Suite",
-					"price": 250,
-					"status": "sent_for_approval"
-				}
-			]
-		})
-		cls.cart_hotel.insert(ignore_permissions=True)
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	BOOKING = {
+		"request_booking_id": "APPROVE_TEST_001",
+		"check_in": "2026-09-10",
+		"check_out": "2026-09-15",
+		"room_count": 1,
+		"request_status": "offer_sent",
+	}
+	HOTELS = [{
+		"hotel_id": "HTL_APR_001",
+		"hotel_name": "Approve Hotel",
+		"supplier": "Direct",
+		"rooms": [
+			{
+				"room_id": "RM_APR_001",
+				"room_rate_id": "RR_APR_001",
+				"room_name": "Standard",
+				"price": 150,
+				"status": "sent_for_approval"
+			},
+			{
+				"room_id": "RM_APR_002",
+				"room_rate_id": "RR_APR_002",
+				"room_name": "Suite",
+				"price": 250,
+				"status": "sent_for_approval"
+			}
+		]
+	}]
 
 	def test_approve_success(self):
-		from destiin.destiin.custom.api.request_booking.request import approve_booking
 		result = approve_booking(
 			request_booking_id="APPROVE_TEST_001",
 			employee=self.employee,
@@ -758,75 +785,82 @@ class TestApproveBooking(IntegrationTestCase):
 		# Non-selected room should be auto-declined
 		self.assertEqual(result["data"]["declined_count"], 1)
 
+
+class TestApprovalValidation(UnitTestCase):
+	"""Test the send_for_approval / approve_booking argument checks without DB state."""
+
+	ITEMS = [{"hotel_id": "HTL001", "room_rate_ids": ["RR001"]}]
+
+	def test_send_for_approval_missing_booking_id(self):
+		result = send_for_approval(request_booking_id="", selected_items=self.ITEMS)
+		self.assertFalse(result["success"])
+
+	def test_send_for_approval_empty_items(self):
+		result = send_for_approval(request_booking_id="APPROVAL_TEST_001", selected_items="[]")
+		self.assertFalse(result["success"])
+
+	def test_send_for_approval_nonexistent_booking(self):
+		with patch.object(_req.frappe, "db") as mock_db:
+			mock_db.get_value.return_value = None
+			result = send_for_approval(request_booking_id="NONEXISTENT_APP_999", selected_items=self.ITEMS)
+		self.assertFalse(result["success"])
+		self.assertIn("not found", result["error"])
+
+	def test_send_for_approval_items_without_hotel_id(self):
+		with patch.object(_req.frappe, "db") as mock_db:
+			result = send_for_approval(request_booking_id="APPROVAL_TEST_001", selected_items=[{"room_rate_ids": ["RR001"]}])
+		self.assertFalse(result["success"])
+		mock_db.get_value.assert_not_called()
+
+	def test_send_for_approval_too_many_items(self):
+		items = [{"hotel_id": f"HTL{i}", "room_rate_ids": []} for i in range(_req.MAX_SELECTED_ITEMS + 1)]
+		result = send_for_approval(request_booking_id="APPROVAL_TEST_001", selected_items=items)
+		self.assertFalse(result["success"])
+
 	def test_approve_missing_employee(self):
-		from destiin.destiin.custom.api.request_booking.request import approve_booking
-		result = approve_booking(
-			request_booking_id="APPROVE_TEST_001",
-			employee="",
-			selected_items=[{"hotel_id": "HTL_APR_001", "room_rate_ids": ["RR_APR_001"]}]
-		)
+		result = approve_booking(request_booking_id="APPROVE_TEST_001", employee="", selected_items=self.ITEMS)
 		self.assertFalse(result["success"])
 
 	def test_approve_nonexistent_booking(self):
-		from destiin.destiin.custom.api.request_booking.request import approve_booking
-		result = approve_booking(
-			request_booking_id="NONEXISTENT_APR_999",
-			employee=self.employee,
-			selected_items=[{"hotel_id": "HTL001", "room_rate_ids": ["RR001"]}]
-		)
+		with patch.object(_req.frappe, "db") as mock_db:
+			mock_db.exists.return_value = None
+			result = approve_booking(
+				request_booking_id="NONEXISTENT_APR_999", employee="EMP-NONE", selected_items=self.ITEMS
+			)
 		self.assertFalse(result["success"])
+		self.assertIn("not found", result["error"])
 
 
 # ---------------------------------------------------------------------------
 # Test: decline_booking
 # ---------------------------------------------------------------------------
 
-class TestDeclineBooking(IntegrationTestCase):
+class TestDeclineBooking(_SeededBookingTestCase):
 	"""Test the decline_booking API."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Decline Co", abbr="TDCC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test Decline Emp")
-		_cleanup_test_booking("DECLINE_TEST_001")
-		cls.booking_doc = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": "DECLINE_TEST_001",
-			"employee": cls.employee,
-			"company": cls.company,
-			"check_in": "2026-09-20",
-			"check_out": "2026-09-25",
-			"room_count": 1,
-			"request_status": "offer_sent",
-		})
-		cls.booking_doc.insert(ignore_permissions=True)
-
-		cls.cart_hotel = frappe.get_doc({
-			"doctype": "Cart Hotel Item",
-			"request_booking": cls.booking_doc.name,
-			"hotel_id": "HTL_DEC_001",
-			"hotel_name": "Decline Hotel",
-			"supplier": "Direct",
-			"rooms": [
-				{
-					"room_id": "RM_DEC_001",
-					"room_rate_id": "RR_DEC_001",
-					"room_name": "Standard",
-					"price": 100,
-					"status": "sent_for_approval"
-				}
-			]
-		})
-		cls.cart_hotel.insert(ignore_permissions=True)
-
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	BOOKING = {
+		"request_booking_id": "DECLINE_TEST_001",
+		"check_in": "2026-09-20",
+		"check_out": "2026-09-25",
+		"room_count": 1,
+		"request_status": "offer_sent",
+	}
+	HOTELS = [{
+		"hotel_id": "HTL_DEC_001",
+		"hotel_name": "Decline Hotel",
+		"supplier": "Direct",
+		"rooms": [
+			{
+				"room_id": "RM_DEC_001",
+				"room_rate_id": "RR_DEC_001",
+				"room_name": "Standard",
+				"price": 100,
+				"status": "sent_for_approval"
+			}
+		]
+	}]
 
 	def test_decline_success(self):
-		from destiin.destiin.custom.api.request_booking.request import decline_booking
 		result = decline_booking(
 			request_booking_id="DECLINE_TEST_001",
 			employee=self.employee,
@@ -839,7 +873,6 @@ class TestDeclineBooking(IntegrationTestCase):
 		self.assertEqual(result["data"]["declined_count"], 1)
 
 	def test_decline_missing_employee(self):
-		from destiin.destiin.custom.api.request_booking.request import decline_booking
 		result = decline_booking(
 			request_booking_id="DECLINE_TEST_001",
 			employee="",
@@ -852,79 +885,78 @@ class TestDeclineBooking(IntegrationTestCase):
 # Test: update_request_status_from_rooms
 # ---------------------------------------------------------------------------
 
-class TestUpdateRequestStatusFromRooms(IntegrationTestCase):
+class TestUpdateRequestStatusFromRooms(_BookingTestBase):
 	"""Test the request status aggregation logic."""
 
+	# scenario -> (request_booking_id, room statuses)
+	SCENARIOS = {
+		"ps": ("STATUS_PS_001", ["pending", "payment_success"]),
+		"apr": ("STATUS_APR_001", ["pending", "approved"]),
+		"dec": ("STATUS_DEC_001", ["declined", "declined"]),
+		"pnd": ("STATUS_PND_001", ["pending", "pending"]),
+	}
+
 	@classmethod
 	def setUpClass(cls):
 		super().setUpClass()
-		cls.company = _ensure_test_company("_Test StatusAgg Co", abbr="TSAC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test StatusAgg Emp")
+		# Build every scenario's booking once; each test reads only its own
+		cls.names = {
+			scenario: cls._create_booking_with_rooms(booking_id, statuses)
+			for scenario, (booking_id, statuses) in cls.SCENARIOS.items()
+		}
 
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	def setUp(self):
+		super().setUp()
+		# Undo each test's writes without rolling back the class fixtures
+		frappe.db.savepoint("test_sp")
 
-	def _create_booking_with_rooms(self, booking_id, room_statuses):
-		"""Helper: create a booking with a hotel whose rooms have the given statuses."""
-		booking = frappe.get_doc({
-			"doctype": "Request Booking Details",
-			"request_booking_id": booking_id,
-			"employee": self.employee,
-			"company": self.company,
-			"check_in": "2026-12-01",
-			"check_out": "2026-12-05",
-			"request_status": "offer_pending",
-		})
-		booking.insert(ignore_permissions=True)
+	def tearDown(self):
+		frappe.db.rollback(save_point="test_sp")
+		super().tearDown()
 
-		rooms = []
-		for i, status in enumerate(room_statuses):
-			rooms.append({
+	@classmethod
+	def _create_booking_with_rooms(cls, booking_id, room_statuses):
+		"""Helper: create a booking with a hotel whose rooms have the given statuses."""
+		rate_prefix = f"RR_{booking_id}_"
+		rooms = [
+			{
 				"room_id": f"RM_{i}",
-				"room_rate_id": f"RR_{booking_id}_{i}",
+				"room_rate_id": f"{rate_prefix}{i}",
 				"room_name": f"Room {i}",
 				"price": 100,
 				"status": status
-			})
-
-		cart_hotel = frappe.get_doc({
-			"doctype": "Cart Hotel Item",
-			"request_booking": booking.name,
-			"hotel_id": f"HTL_{booking_id}",
-			"hotel_name": "Status Test Hotel",
-			"rooms": rooms
-		})
-		cart_hotel.insert(ignore_permissions=True)
-		return booking.name
-
-	def test_payment_success_priority(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
-		name = self._create_booking_with_rooms("STATUS_PS_001", ["pending", "payment_success"])
-		result = update_request_status_from_rooms(name)
-		self.assertEqual(result, "req_payment_success")
-
-	def test_approved_priority(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
-		name = self._create_booking_with_rooms("STATUS_APR_001", ["pending", "approved"])
-		result = update_request_status_from_rooms(name)
-		self.assertEqual(result, "approval_received")
-
-	def test_all_declined(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
-		name = self._create_booking_with_rooms("STATUS_DEC_001", ["declined", "declined"])
-		result = update_request_status_from_rooms(name)
-		self.assertEqual(result, "req_cancelled")
-
-	def test_mixed_pending(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
-		name = self._create_booking_with_rooms("STATUS_PND_001", ["pending", "pending"])
-		result = update_request_status_from_rooms(name)
-		self.assertEqual(result, "offer_pending")
+			}
+			for i, status in enumerate(room_statuses)
+		]
+
+		return _bulk_seed_booking(
+			{
+				"request_booking_id": booking_id,
+				"employee": cls.employee,
+				"company": cls.company,
+				"check_in": "2026-12-01",
+				"check_out": "2026-12-05",
+				"request_status": "offer_pending",
+			},
+			hotels=[{
+				"hotel_id": f"HTL_{booking_id}",
+				"hotel_name": "Status Test Hotel",
+				"rooms": rooms
+			}]
+		)
+
+	def test_status_priority_matrix(self):
+		cases = (
+			("ps", "req_payment_success"),
+			("apr", "approval_received"),
+			("dec", "req_cancelled"),
+			("pnd", "offer_pending"),
+		)
+		for scenario, expected in cases:
+			with self.subTest(scenario=scenario):
+				self.assertEqual(update_request_status_from_rooms(self.names[scenario]), expected)
 
 	def test_no_booking(self):
-		from destiin.destiin.custom.api.request_booking.request import update_request_status_from_rooms
 		result = update_request_status_from_rooms(None)
 		self.assertIsNone(result)
 
@@ -937,57 +969,83 @@ class TestGetNextAgentRoundRobin(IntegrationTestCase):
 	"""Test agent round-robin assignment."""
 
 	def test_returns_agent_or_none(self):
-		from destiin.destiin.custom.api.request_booking.request import get_next_agent_round_robin
 		agent = get_next_agent_round_robin()
 		# Should be a valid user or None (if no agents exist)
 		if agent:
-			self.assertTrue(frappe.db.exists("User", agent))
+			self.assertTrue(frappe.db.exists("User", agent, cache=True))
+
+
+class TestGetNextAgentRoundRobinUnit(UnitTestCase):
+	"""Test the round-robin selection logic against stubbed queries."""
+
+	@staticmethod
+	def _stub_get_all(agents, enabled, assignments):
+		"""Return a get_all side effect answering the Has Role, User and Request Booking Details queries."""
+		def get_all(doctype, **kwargs):
+			if doctype == "Has Role":
+				return agents if kwargs["filters"]["role"] == "Agent" else []
+			if doctype == "User":
+				return enabled
+			return [frappe._dict(agent=a, creation=c) for a, c in assignments]
+		return get_all
+
+	def test_no_agents(self):
+		with patch.object(_req.frappe, "get_all", side_effect=self._stub_get_all([], [], [])):
+			self.assertIsNone(get_next_agent_round_robin())
+
+	def test_first_agent_when_no_assignments(self):
+		with patch.object(_req.frappe, "get_all", side_effect=self._stub_get_all(["u1", "u2"], ["u1", "u2"], [])):
+			self.assertEqual(get_next_agent_round_robin(), "u1")
+
+	def test_prefers_never_assigned_agent(self):
+		stub = self._stub_get_all(["u1", "u2"], ["u1", "u2"], [("u1", _JAN_15_2026)])
+		with patch.object(_req.frappe, "get_all", side_effect=stub):
+			self.assertEqual(get_next_agent_round_robin(), "u2")
+
+	def test_picks_least_recently_assigned(self):
+		stub = self._stub_get_all(
+			["u1", "u2"], ["u1", "u2"], [("u1", _MAR_05_2026), ("u2", _MAR_01_2026), ("u1", _JAN_15_2026)]
+		)
+		with patch.object(_req.frappe, "get_all", side_effect=stub):
+			self.assertEqual(get_next_agent_round_robin(), "u2")
 
 
 # ---------------------------------------------------------------------------
 # Test: Shared helper functions
 # ---------------------------------------------------------------------------
 
-class TestSharedHelpers(IntegrationTestCase):
+class TestSharedHelpers(_BookingTestBase):
 	"""Test the shared helper functions used by GET APIs."""
 
-	@classmethod
-	def setUpClass(cls):
-		super().setUpClass()
-		cls.company = _ensure_test_company("_Test Helper Co", abbr="THPC")
-		cls.employee = _ensure_test_employee(cls.company, "_Test Helper Emp")
+	def setUp(self):
+		super().setUp()
+		# Undo each test's writes without rolling back the class fixtures
+		frappe.db.savepoint("test_sp")
 
-	@classmethod
-	def tearDownClass(cls):
-		frappe.db.rollback()
-		super().tearDownClass()
+	def tearDown(self):
+		frappe.db.rollback(save_point="test_sp")
+		super().tearDown()
 
 	def test_get_employee_info(self):
-		from destiin.destiin.custom.api.request_booking.request import _get_employee_info
 		name, phone, level = _get_employee_info(self.employee)
-		self.assertEqual(name, "_Test Helper Emp")
+		self.assertEqual(name, "_Test Destiin Shared Emp")
 
 	def test_get_employee_info_empty(self):
-		from destiin.destiin.custom.api.request_booking.request import _get_employee_info
 		name, phone, level = _get_employee_info("")
 		self.assertEqual(name, "")
 
 	def test_get_company_display_name(self):
-		from destiin.destiin.custom.api.request_booking.request import _get_company_display_name
 		name = _get_company_display_name(self.company)
-		self.assertEqual(name, "_Test Helper Co")
+		self.assertEqual(name, "_Test Destiin Shared Co")
 
 	def test_get_company_display_name_empty(self):
-		from destiin.destiin.custom.api.request_booking.request import _get_company_display_name
 		name = _get_company_display_name("")
 		self.assertEqual(name, "")
 
 	def test_get_hotel_booking_id_none(self):
-		from destiin.destiin.custom.api.request_booking.request import _get_hotel_booking_id
 		bid = _get_hotel_booking_id(None)
 		self.assertEqual(bid, "NA")
 
 	def test_get_hotel_booking_id_empty(self):
-		from destiin.destiin.custom.api.request_booking.request import _get_hotel_booking_id
 		bid = _get_hotel_booking_id("")
 		self.assertEqual(bid, "NA")
@@ -7,3 +7,8 @@ from frappe.model.document import Document
 
 class CartHotelRoom(Document):
 	pass
+
+
+def on_doctype_update():
+	# Room lookups filter by parent together with status
+	frappe.db.add_index("Cart Hotel Room", ["parent", "status"])
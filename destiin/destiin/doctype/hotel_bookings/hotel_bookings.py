@@ -127,20 +127,19 @@ def _send_company_btc_report(company_name):
 	Send bill-to-company pending payment report for a specific company.
 	Returns dict with booking_count and email_sent status.
 	"""
-	# Get company email
-	try:
-		company_doc = frappe.get_doc("Company", company_name)
-		company_email = company_doc.email
-		frappe.log_error(
-			message=f"Company '{company_name}' found - email: {company_email}",
-			title="BTC Report - Company Email Lookup"
-		)
-	except frappe.DoesNotExistError:
+	# Get company email (only the field needed, not the whole Company doc)
+	company_row = frappe.db.get_value("Company", company_name, ["name", "email"], as_dict=True)
+	if not company_row:
 		frappe.log_error(
 			message=f"Company '{company_name}' does NOT exist in Company doctype. Skipping.",
 			title="BTC Report - Company Not Found"
 		)
 		return None
+	company_email = company_row.email
+	frappe.log_error(
+		message=f"Company '{company_name}' found - email: {company_email}",
+		title="BTC Report - Company Email Lookup"
+	)
 
 	if not company_email:
 		frappe.log_error(
@@ -464,8 +463,8 @@ def _generate_btc_email_body(company_name, bookings, csv_file_url=None):
 
 	grand_total = total_revenue + total_tax
 
-	# Generate booking rows for the table
-	booking_rows = ""
+	# Generate booking rows for the table (collected in a list and joined once)
+	row_parts = []
 	for idx, booking in enumerate(bookings, 1):
 		amount = float(booking.get("total_amount") or 0)
 		tax = float(booking.get("tax") or 0)
@@ -480,7 +479,7 @@ def _generate_btc_email_body(company_name, bookings, csv_file_url=None):
 
 		bg_color = "#ffffff" if idx % 2 == 1 else "#f8f9fa"
 
-		booking_rows += f"""
+		row_parts.append(f"""
 		<tr style="background-color: {bg_color};">
 			<td style="padding: 10px 12px; border-bottom: 1px solid #e0e0e0; font-size: 13px; color: #333;">{idx}</td>
 			<td style="padding: 10px 12px; border-bottom: 1px solid #e0e0e0; font-size: 13px; color: #333;">{booking.get("booking_id") or booking.get("name") or ""}</td>
@@ -491,7 +490,8 @@ def _generate_btc_email_body(company_name, bookings, csv_file_url=None):
 			<td style="padding: 10px 12px; border-bottom: 1px solid #e0e0e0; font-size: 13px; color: #333; text-align: right;">{amount:,.2f}</td>
 			<td style="padding: 10px 12px; border-bottom: 1px solid #e0e0e0; font-size: 13px; color: #333; text-align: right;">{tax:,.2f}</td>
 			<td style="padding: 10px 12px; border-bottom: 1px solid #e0e0e0; text-align: center;">{payment_link_html}</td>
-		</tr>"""
+		</tr>""")
+	booking_rows = "".join(row_parts)
 
 	today = getdate(nowdate())
 	current_year = datetime.now().year
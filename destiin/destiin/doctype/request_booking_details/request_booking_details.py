@@ -12,3 +12,8 @@ class RequestBookingDetails(Document):
 			check_in_str = str(self.check_in).replace("-", "")
 			check_out_str = str(self.check_out).replace("-", "")
 			self.request_booking_id = f"{self.employee}_{check_in_str}_{check_out_str}"
+
+
+def on_doctype_update():
+	# Employee booking lists are filtered by employee and sorted by modified desc
+	frappe.db.add_index("Request Booking Details", ["employee", "modified"])
@@ -265,7 +265,8 @@ def generate_btc_email_body(company_name, bookings, total_amount, currency,
     - Bulk: summary table + single consolidated 'Pay Now' button.
     - Individual: table with per-booking payment links.
     """
-    booking_rows = ""
+    # Rows are collected in a list and joined once
+    row_parts = []
     for b in bookings:
         booking_id = b.get("booking_id") or b.get("name") or "-"
         employee_name = b.get("employee_name") or "-"
@@ -286,7 +287,7 @@ def generate_btc_email_body(company_name, bookings, total_amount, currency,
         else:
             pay_cell = ""
 
-        booking_rows += (
+        row_parts.append(
             f'<tr>'
             f'<td style="padding:8px 12px;border-bottom:1px solid #e0e0e0;">{booking_id}</td>'
             f'<td style="padding:8px 12px;border-bottom:1px solid #e0e0e0;">{employee_name}</td>'
@@ -298,6 +299,7 @@ def generate_btc_email_body(company_name, bookings, total_amount, currency,
             f'{pay_cell}'
             f'</tr>'
         )
+    booking_rows = "".join(row_parts)
 
     pay_col_header = (
         '<th style="padding:10px 12px;text-align:center;font-size:12px;color:#666;font-weight:600;">Pay</th>'
@@ -436,13 +438,12 @@ def send_company_booking_report(company_name, start_of_week, end_of_week, logger
     Fetches Hotel Booking Config to determine btc_payment_type (Bulk / Individual)
     and generates payment links accordingly for all pending BTC bookings.
     """
-    # Get company email
-    try:
-        company = frappe.get_doc("Company", company_name)
-        company_email = company.email
-    except frappe.DoesNotExistError:
+    # Get company email (only the field needed, not the whole Company doc)
+    company = frappe.db.get_value("Company", company_name, ["name", "email"], as_dict=True)
+    if not company:
         logger.warning(f"Company {company_name} not found in Company doctype. Skipping.")
         return
+    company_email = company.email
 
     if not company_email:
         logger.warning(f"No email configured for company {company_name}. Skipping.")